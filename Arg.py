@@ -2,13 +2,111 @@
 Argument class definition for specifying argument dependencies and parsing to be used with Python's argparse
 """
 import argparse
+import copy
+import importlib
 from typing import Callable, Union, Type, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 
 from DynamicDefaults import DynamicDefaults, ConfigType, DYNAMIC_DEFAULT_FLAG
+from ConstraintCheckers import ConstraintChecker
 
+# ArgsGroup classes given as "module:ClassName" strings in children_args, imported the first time they are spawned
+_CONFIG_CLASS_CACHE: Dict[str, Type] = {}
 
-@dataclass
+
+def resolve_config_class(config_class: Union[Type, str]) -> Type:
+    """
+    Returns config_class itself or, if it is a "module:ClassName" string, imports the module and returns the class.
+    This allows children_args to refer to configs without importing their modules until they are needed.
+    """
+    if not isinstance(config_class, str):
+        return config_class
+    if config_class not in _CONFIG_CLASS_CACHE:
+        module_name, _, class_name = config_class.partition(':')
+        _CONFIG_CLASS_CACHE[config_class] = getattr(importlib.import_module(module_name), class_name)
+    return _CONFIG_CLASS_CACHE[config_class]
+
+
+class Choices(tuple):
+    """
+    The choices of an Arg with an O(1) membership test. It is still an ordered tuple so that argparse's help and error
+        messages list the choices as they were given.
+    """
+    def __new__(cls, choices):
+        self = super().__new__(cls, choices)
+        try:
+            self._lookup = frozenset(self)
+        except TypeError:  # unhashable choices: fall back to the tuple's linear scan
+            self._lookup = tuple(self)
+        return self
+
+    def __contains__(self, value):
+        try:
+            return value in self._lookup
+        except TypeError:  # unhashable value
+            return False
+
+
+def _build_type_caster(arg_type: type) -> Callable:
+    """
+    Returns Arg.cast_value_to_arg_type specialized for the given type. The sanitizer below casts with it too.
+    """
+    def cast_value_to_arg_type(value):
+        if value is None or type(value) is arg_type:  # e.g. defaults are typically already of the right type
+            return value
+        return arg_type(value)
+
+    return cast_value_to_arg_type
+
+
+def _build_sanitizer(cast_value_to_arg_type: Callable, arg_type: type, choices: Choices, constraint_check_fn: Callable,
+                     name: str) -> Callable:
+    """
+    Returns Arg.sanitize_value_for_consumption specialized for the given type, choices and constraint_check_fn.
+    Since these are fixed after the Arg's construction, the returned function does not check which of them are set.
+    cast_value_to_arg_type is the Arg's caster (see _build_type_caster).
+    """
+    has_choices = choices is not None and len(choices) >= 1
+    if isinstance(constraint_check_fn, ConstraintChecker):
+        constraint_check_fn = constraint_check_fn.as_function()
+
+    def sanitize(value):
+        new_value = cast_value_to_arg_type(value)
+        # check type
+        assert isinstance(new_value, arg_type) or (new_value is None), \
+            f"Invalid value {new_value} type {type(new_value)} where arg.type is {arg_type} for arg {name}."
+        # then we check constraint
+        if constraint_check_fn is not None:
+            constraint_check_fn(new_value)
+        # check another implicit constraint
+        if has_choices and value is not None:
+            assert value in choices, f"Received value (={value}) that are not in choices (={choices})."
+        return new_value
+
+    return sanitize
+
+
+# Args are frozen: the same Arg instance is the default of a field for every instance of a config. The derived fields
+# are set once with _set_field while constructing the Arg.
+_set_field = object.__setattr__
+# derived fields that are rebuilt instead of being pickled or copied: the closures cannot be pickled and the hash is only
+# valid in the process that computed it. See Arg.__reduce__
+_REBUILT_FIELDS = ('_hash', '_cast', '_sanitize')
+
+
+def _rebuild_arg(arg_class: Type['Arg'], state: dict) -> 'Arg':
+    """
+    Returns an arg_class with the fields in state and the _REBUILT_FIELDS rebuilt from them. __post_init__ is skipped
+        since the state already holds the derived fields (e.g. default is DYNAMIC_DEFAULT_FLAG).
+    """
+    arg = object.__new__(arg_class)
+    for name, value in state.items():
+        _set_field(arg, name, value)
+    arg._set_rebuilt_fields()
+    return arg
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Arg:
     """
     Arg class to handle arguments constraints and dependencies. Helps with adding only necessary args.
@@ -26,38 +124,78 @@ class Arg:
     # advanced args fields to manage dependencies between Args
     constraint_check_fn: Callable[[ConfigType], bool] = None
     dependencies: dict = None  # this narrows down the possible choices an Arg can take on depending on other args
-    # this spawns children ArgsGroup when a selection is chosen
-    children_args: Dict[ConfigType, Type] = None
+    # this spawns children ArgsGroup when a selection is chosen. Classes can be given as "module:ClassName" strings
+    children_args: Dict[ConfigType, Union[Type, str]] = None
     # dynamic_defaults are primarily handled in ArgsGroup.get_dynamic_default_for_arg
     dynamic_defaults_dict: Dict = None
+    # attributes derived in __post_init__. These are declared as fields so that they get a slot.
+    dynamic_default: DynamicDefaults = field(default=None, init=False, repr=False, compare=False)
+    _arg_dict: dict = field(default=None, init=False, repr=False, compare=False)
+    _hash: int = field(default=None, init=False, repr=False, compare=False)
+    _parse_name: str = field(default=None, init=False, repr=False, compare=False)
+    _cast: Callable = field(default=None, init=False, repr=False, compare=False)
+    _sanitize: Callable = field(default=None, init=False, repr=False, compare=False)
+    _has_children: bool = field(default=False, init=False, repr=False, compare=False)
+    _default_coerced: ConfigType = field(default=None, init=False, repr=False, compare=False)
     # some other helper vars
     _valid_actions = ['store_true', 'store_false', 'store']
+    _quote_in_format = False  # whether format_description quotes the value
 
     def __post_init__(self):
         assert self.type is not None, "Must set the type in children class or explicitly"
         assert len(self.name) > 1, "Abbreviations are not allowed (for now)."
+        assert self.name[0] != '-' or self.name.startswith('--'), \
+            f"Arg name {self.name} should either have no leading dash or start with '--'."
         assert self.action is None or self.action in self._valid_actions, \
             f"action can only be within {self._valid_actions}"
         # dynamic defaults setting
-        self.dynamic_default = None
         if self.dynamic_defaults_dict is not None:
-            self.dynamic_default = DynamicDefaults(
+            _set_field(self, 'dynamic_default', DynamicDefaults(
                 default_field=self.dynamic_defaults_dict['dynamic_default_field'],
                 default_map=DynamicDefaults.get_default_map_from_default_dict(self.dynamic_defaults_dict, self.name),
                 fallback_value=self.default
-            )
-            self.default = DYNAMIC_DEFAULT_FLAG  # set default to this object so we know when user passes new value
+            ))
+            # set default to this object so we know when user passes new value
+            _set_field(self, 'default', DYNAMIC_DEFAULT_FLAG)
+        if self.choices is not None and not isinstance(self.choices, Choices):
+            # both argparse and the sanitizer test membership in choices on every parse
+            _set_field(self, 'choices', Choices(self.choices))
+        # these fields do not change after construction so we only build the add_argument kwargs and hash once
+        _set_field(self, '_arg_dict', self._build_arg_dict())
+        _set_field(self, '_parse_name', self.name if self.name.startswith('--') else '--' + self.name)
+        self._set_rebuilt_fields()
+        _set_field(self, '_has_children', self.children_args is not None)
+        _set_field(self, '_default_coerced', self._coerce_default())
+
+    def _set_rebuilt_fields(self):
+        """
+        Sets the _REBUILT_FIELDS, i.e. the hash, the caster and the sanitizer, from the other fields.
+        """
+        _set_field(self, '_hash', hash((self.name, self.help, self.type)))
+        _set_field(self, '_cast', _build_type_caster(self.type))
+        _set_field(self, '_sanitize', _build_sanitizer(
+            self._cast, self.type, self.choices, self.constraint_check_fn, self.name))
+
+    def __reduce__(self):
+        # used by pickle and copy. The state leaves out the _REBUILT_FIELDS, see _rebuild_arg
+        state = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in _REBUILT_FIELDS}
+        return _rebuild_arg, (type(self), state)
 
     def add_dependencies(self, dependencies: dict):
-        if self.dependencies is None:
-            self.dependencies = dependencies
-        else:
-            self.dependencies.update(dependencies)
+        """
+        Adds dependencies to the Arg's dependencies in place. The Arg is frozen but dependencies are not derived from
+            any other field so they can be updated after construction (the given dict itself is not modified).
+        """
+        _set_field(self, 'dependencies', {**(self.dependencies or {}), **dependencies})
 
     def get_arg_dict(self) -> dict:
         """
         Returns a dictionary that contains all the information to pass into argparse's add_argument
+        The dictionary is shared across calls so callers should not modify it.
         """
+        return self._arg_dict
+
+    def _build_arg_dict(self) -> dict:
         arg_dict = {'help': self.help, 'default': self.default}
         if self.action is not None:
             arg_dict['action'] = self.action
@@ -68,29 +206,52 @@ class Arg:
 
         return arg_dict
 
+    def get_parse_name(self) -> str:
+        """
+        Returns the option string used for this Arg on the command line (e.g. '--lr')
+        """
+        return self._parse_name
+
     def add_arg_to_parser(self, parser: argparse.ArgumentParser):
-        parse_name = self.name if self.name[0] == '-' and self.name[1] == '-' else f'--{self.name}'
-        parser.add_argument(f"{parse_name}", **self.get_arg_dict())
+        parser.add_argument(self._parse_name, **self._arg_dict)
 
     def get_name(self):
         return self.name
 
     def get_new_arg_with_new_value(self, new_value):
-        return Arg(self.name, default=new_value, help=self.help, action=self.action,
-                   choices=self.choices, nargs=self.nargs,
-                   type=self.type, constraint_check_fn=self.constraint_check_fn, dependencies=self.dependencies,
-                   children_args=self.children_args)
+        """
+        Returns a copy of self (of the same Arg subclass) with default set to new_value.
+        The copy skips __post_init__ so only the attributes derived from the default are rebuilt.
+        """
+        new_arg = copy.copy(self)
+        _set_field(new_arg, 'default', new_value)
+        _set_field(new_arg, '_arg_dict', new_arg._build_arg_dict())
+        _set_field(new_arg, '_default_coerced', new_arg._coerce_default())
+        return new_arg
+
+    def _coerce_default(self) -> ConfigType:
+        """
+        Returns the default converted to the Arg's type when it already is an instance of it (e.g. True -> 1 for an
+            IntArg). This is the value set by ArgsGroup.set_children_args_to_default_values.
+        """
+        if isinstance(self.type, type) and isinstance(self.default, self.type):
+            return self.type(self.default)
+        return self.default
+
+    def __eq__(self, other):
+        # Args are identified by their name, help and type: the same fields as __hash__ so that equal Args hash equally
+        return self is other or (type(other) is type(self) and self.name == other.name and self.help == other.help
+                                 and self.type == other.type)
 
     def __hash__(self):
-        return hash(f"{self.name}{self.help}{str(self.type)}")
+        return self._hash
 
     def __str__(self):
         return f"{str(self.default)}"
 
     def format_description(self) -> str:
-        result = f"{self.name}:\t"
-        result += f"'{str(self)}'\n" if isinstance(self, StrArg) else f"{str(self)}\n"
-        return result
+        quote = "'" if self._quote_in_format else ""
+        return self.name + ":\t" + quote + str(self.default) + quote + "\n"
 
     def cast_value_to_arg_type(self, value):
         """
@@ -98,20 +259,14 @@ class Arg:
         Given a value, typically either from the user setting the Arg or the parser setting the default,
             depending on what the value is (a normal value, None, DYNAMIC_DEFAULT) we either cast it to correct type or
             set it to some default value.
+        This is the cast performed by sanitize_value_for_consumption (see _build_type_caster).
         """
-        if value is None:
-            new_value = value
-        else:
-            new_value = self.type(value)
-        return new_value
-
-    def get(self, name):
-        # need to check anything?
-        return getattr(self, name)
+        return self._cast(value)
 
     def check_constraint(self, value) -> bool:
         """
         Check if user input value is valid according to the constraint_check_fn
+        sanitize_value_for_consumption performs the same check on the cast value.
         """
         if self.constraint_check_fn is not None:
             return self.constraint_check_fn(value)
@@ -124,17 +279,9 @@ class Arg:
         """
         Arg constraint checking and type casting
         Sanitize the value given by the namespace
+        See _build_sanitizer for the checks performed.
         """
-        new_value = self.cast_value_to_arg_type(value)
-        # check type
-        assert isinstance(new_value, self.type) or (new_value is None), \
-            f"Invalid value {new_value} type {type(new_value)} where arg.type is {self.type} for arg {self.name}."
-        # then we check constraint
-        self.check_constraint(new_value)
-        # check another implicit constraint
-        if value is not None and self.choices is not None and len(self.choices) >= 1:
-            assert value in self.choices, f"Received value (={value}) that are not in choices (={self.choices})."
-        return new_value
+        return self._sanitize(value)
 
     def spawn_children_args(self, value: ConfigType) -> Union[Type, None]:
         """
@@ -142,32 +289,30 @@ class Arg:
         Depending on what the final value is,
             returns an ArgsGroup subclass to be constructed.
         """
-        if self.children_args is None:
+        if not self._has_children:
             return None
-        if value in self.children_args:
-            return self.children_args[value]
-        return None
+        config_class = self.children_args.get(value)
+        return None if config_class is None else resolve_config_class(config_class)
 
 
+# The subclasses only change the default type and have to be frozen like Arg. eq=False keeps Arg's __eq__ and __hash__
+# (otherwise the generated __eq__ would unset __hash__ and the Args could not be used as dataclass defaults).
+@dataclass(frozen=True, slots=True, eq=False)
 class IntArg(Arg):
-    def __post_init__(self):
-        self.type = int
-        super().__post_init__()
+    type: type = int
 
 
+@dataclass(frozen=True, slots=True, eq=False)
 class StrArg(Arg):
-    def __post_init__(self):
-        self.type = str
-        super().__post_init__()
+    type: type = str
+    _quote_in_format = True
 
 
+@dataclass(frozen=True, slots=True, eq=False)
 class FloatArg(Arg):
-    def __post_init__(self):
-        self.type = float
-        super().__post_init__()
+    type: type = float
 
 
+@dataclass(frozen=True, slots=True, eq=False)
 class BoolArg(Arg):
-    def __post_init__(self):
-        self.type = bool
-        super().__post_init__()
+    type: type = bool
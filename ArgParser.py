@@ -4,33 +4,197 @@ Parse a tree of ArgsGroup, starting from a given root.
 For each ArgsGroup, create a new argument group if the argsgroup_name or description is not none
 """
 
-from ArgsGroup import ArgsGroup
 import argparse
-from typing import Dict, Any
+import re
+import sys
+from typing import Dict, Any, Callable, Iterable, List, Tuple, TYPE_CHECKING
 
+if TYPE_CHECKING:  # ArgParser only needs ArgsGroup and Arg for type hints
+    from ArgsGroup import ArgsGroup
+    from Arg import Arg
 
-def parse_and_process_argsgroup(argsgroup: ArgsGroup, root_parser, rem_args) -> list[str]:
+
+HELP_FLAGS = ('-h', '--help')
+# same as argparse: these are values and not option strings (our parsers never define negative number-like options)
+_negative_number_matcher = re.compile(r'^-\d+$|^-\d*\.\d+$')
+
+
+def is_option_string(arg: str) -> bool:
+    """
+    Returns whether argparse would treat arg as an option string (as opposed to a value) when it matches none of the
+        parser's options. Like argparse, check the known options first: e.g. --run_name=my run is an option of a
+        parser that has --run_name even though it contains a space.
+    """
+    return (len(arg) > 1 and arg[0] == '-' and ' ' not in arg
+            and not _negative_number_matcher.match(arg))
+
+
+def split_args_for_options(args: List[str], option_strings: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split args into the options (along with their values) that can belong to one of option_strings and the rest.
+    An option can belong to option_strings if it is one of them or an abbreviation of one of them.
+    Giving a parser only its own options keeps each parse_known_args linear in the number of args of its ArgsGroup
+        instead of rescanning all the remaining args (argparse's scan over the option indices is quadratic).
+    """
+    option_strings = tuple(option_strings)
+    own_args, other_args = [], []
+    current_args = other_args  # values before the first option string are not ours
+    for i, arg in enumerate(args):
+        if arg == '--':  # everything after this is not an option
+            other_args.extend(args[i:])
+            break
+        if len(arg) > 1 and arg[0] == '-':
+            # as argparse does, match the known options (and their abbreviations) before the value heuristics
+            option = arg.split('=', 1)[0]
+            if any(option_string.startswith(option) for option_string in option_strings):
+                current_args = own_args
+            elif is_option_string(arg):
+                current_args = other_args
+        current_args.append(arg)
+    return own_args, other_args
+
+
+# the parser caches below keep at most this many parsers each. Configs that create their Args at construction (e.g.
+# in __post_init__) get a new parser for every instance, so an unbounded cache would grow with every parse.
+MAX_CACHED_PARSERS = 128
+
+
+def get_or_build_cached_parser(cache: Dict[tuple, tuple], key: tuple, keep_alive: Any,
+                               build: Callable[[], argparse.ArgumentParser]) -> argparse.ArgumentParser:
     """
-    Adds group to root parser (as an argument group), create new parser to parse and store to argsgroup.
+    Returns the parser cached under key or builds it with build(). The cache is a least recently used cache of at most
+        MAX_CACHED_PARSERS parsers. The keys contain Arg ids, so keep_alive (the Args) is stored along with the parser
+        to keep the Args alive while their ids are in the cache (so that their ids cannot be reused).
+    """
+    entry = cache.pop(key, None)  # re-inserted below as the most recently used
+    if entry is None:
+        entry = (keep_alive, build())
+        if len(cache) >= MAX_CACHED_PARSERS:
+            del cache[next(iter(cache))]  # the least recently used
+    cache[key] = entry
+    return entry[1]
+
+
+# template parsers keyed by the ids of the Args they contain. See get_or_build_cached_parser
+_PARSER_TEMPLATES: Dict[Tuple[int, ...], Tuple[List['Arg'], argparse.ArgumentParser]] = {}
+
+
+def _build_parser_template(args: List['Arg']) -> argparse.ArgumentParser:
+    template = argparse.ArgumentParser(add_help=False)
+    for arg in args:
+        arg.add_arg_to_parser(template)
+    return template
+
+
+def get_parser_template(args: List['Arg']) -> argparse.ArgumentParser:
+    """
+    Returns a parser (without -h) that contains args. It is built once per list of Arg objects and meant to be passed
+        as a parent to new parsers: argparse then copies its actions instead of running add_argument for each Arg.
+    Since the Args of a config class are its dataclass defaults, every instance of that config shares one template.
+    """
+    return get_or_build_cached_parser(
+        _PARSER_TEMPLATES, tuple(id(arg) for arg in args), args, lambda: _build_parser_template(args))
+
+
+# parsers for a level of the ArgsGroup tree keyed by the program name and the ids of each group's Args. See
+# get_or_build_cached_parser
+_LEVEL_PARSERS: Dict[tuple, Tuple[List[List['Arg']], argparse.ArgumentParser]] = {}
+
+
+def get_level_parser(argsgroups: List['ArgsGroup'], prog: str) -> argparse.ArgumentParser:
+    """
+    Returns a parser for the Args of all the argsgroups, built from their templates (see get_parser_template).
+    The parser is built once per combination of Arg objects on a level, which for configs whose Args are dataclass
+        defaults is once per combination of config classes. parse_known_args does not modify the parser so it is
+        reused by every parse that reaches the same Args.
+    """
+    groups_args = [argsgroup.get_children_args() for argsgroup in argsgroups]
+    key = (prog, *(tuple(id(arg) for arg in args) for args in groups_args))
+    return get_or_build_cached_parser(
+        _LEVEL_PARSERS, key, groups_args,
+        lambda: argparse.ArgumentParser(prog=prog, parents=[get_parser_template(args) for args in groups_args]))
+
+
+def parse_known_args_for_argsgroups(argsgroups: List['ArgsGroup'], parser: argparse.ArgumentParser, args: List[str]):
+    """
+    Same as parser.parse_known_args(args) but only passes the options of the argsgroups' Args to the parser.
+    """
+    option_strings = [arg.get_parse_name() for argsgroup in argsgroups for arg in argsgroup.get_children_args()]
+    own_args, other_args = split_args_for_options(args, option_strings)
+    namespace, rem_args = parser.parse_known_args(own_args)
+    return namespace, rem_args + other_args
+
+
+class LazyArgumentParser(argparse.ArgumentParser):
+    """
+    ArgumentParser that supports lazy argument groups.
+    A lazy group (and its args) is only added to the parser when the help message is formatted (e.g. for --help or when
+        reporting an error). During normal parsing, we never pay for building them.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._unrealized_groups = []
+
+    def add_lazy_argument_group(self, argsgroup: 'ArgsGroup'):
+        """
+        Adds argsgroup as an argument group that is built on demand by realize_lazy_argument_groups.
+        This must be called before argsgroup consumes its args since consuming replaces the Args by their values.
+        """
+        self._unrealized_groups.append(
+            (argsgroup.get_name(), argsgroup.get_description(), argsgroup.get_children_args()))
+
+    def realize_lazy_argument_groups(self):
+        for name, description, args in self._unrealized_groups:
+            group = self.add_argument_group(name, description)
+            for arg in args:
+                arg.add_arg_to_parser(group)
+        self._unrealized_groups = []
+
+    def format_help(self):
+        self.realize_lazy_argument_groups()
+        return super().format_help()
+
+
+def parse_and_process_argsgroups(argsgroups: List['ArgsGroup'], root_parser: LazyArgumentParser, rem_args) -> list[str]:
+    """
+    Parse a list of ArgsGroup (typically one level of the ArgsGroup tree) with a single parser and store the parsed
+        values to each argsgroup in order.
+    Also adds each group to root parser (as a lazy argument group).
     This function modifies the rem_args by parsing the known args there and modifying rem_args
     """
-    # first we add the group to the root parser for printing out help messages
-    group = root_parser.add_argument_group(argsgroup.get_name(), argsgroup.get_description())
-    argsgroup.add_children_args_to_parser(group)
-    # we don't parse with the main parser though. we parse each namespace individually
-    group_parser = argsgroup.get_new_parser()
-    namespace, rem_args = group_parser.parse_known_args(rem_args)
-    # consume the args.
-    spawned_children_argsgroup = argsgroup.process_and_consume_args_with_namespace(namespace)
-    # if there is any spawned children argsgroup, parse and process them
-    for child in spawned_children_argsgroup:
-        rem_args = parse_and_process_argsgroup(child, root_parser, rem_args)
+    # first we add the groups to the root parser for printing out help messages. They are only built on demand.
+    for argsgroup in argsgroups:
+        root_parser.add_lazy_argument_group(argsgroup)
+    # we don't parse with the main parser though. we parse all the argsgroups' args at once with a level parser
+    group_parser = get_level_parser(argsgroups, root_parser.prog)
+    namespace, rem_args = parse_known_args_for_argsgroups(argsgroups, group_parser, rem_args)
+    # then dispatch the values back to their argsgroup. The order matters for dynamic defaults between siblings.
+    for argsgroup in argsgroups:
+        fields = argsgroup.get_children_args_fields_to_value()
+        argsgroup_namespace = argparse.Namespace(**{field: getattr(namespace, field) for field in fields})
+        # consume the args. The spawned children are parsed right away, before the later siblings consume theirs, so
+        # that the siblings' dynamic defaults can depend on the spawned children's args.
+        spawned_children_argsgroup = argsgroup.process_and_consume_args_with_namespace(argsgroup_namespace)
+        if len(spawned_children_argsgroup) > 0:
+            rem_args = parse_argsgroups_level_by_level(spawned_children_argsgroup, root_parser, rem_args)
     # then we return the rem_args
     return rem_args
 
 
+def parse_argsgroups_level_by_level(level: List['ArgsGroup'], root_parser: LazyArgumentParser, rem_args) -> list[str]:
+    """
+    Parse the subtrees of the ArgsGroup in level, one level at a time (see parse_and_process_argsgroups).
+    The children spawned while parsing a level have already been parsed with their whole subtree so they are skipped.
+    """
+    while len(level) > 0:
+        rem_args = parse_and_process_argsgroups(level, root_parser, rem_args)
+        level = [child for argsgroup in level for child in argsgroup.get_children_argsgroup()
+                 if not child.are_args_consumed()]
+    return rem_args
+
+
 class ArgParser:
-    def __init__(self, root: ArgsGroup):
+    def __init__(self, root: 'ArgsGroup'):
         """
         Initialize a parser that parses an ArgsGroup tree from root.
         To use dynamic defaults, set default in Arg to DYNAMIC_DEFAULT and fill out the Arg's setting in default_dict
@@ -43,25 +207,32 @@ class ArgParser:
 
     def parse_args_recursively(self, parse_str=None) -> argparse.ArgumentParser:
         """
-        Main method to parse args. Parse args recursively from the root in a BFS manner.
+        Main method to parse args. Parse args recursively from the root in a BFS manner (one parser per level).
             Consume defaults or set defaults dynamically.
+        Children ArgsGroup are only visited once their parent has been parsed, so only the ArgsGroup on the chosen path
+            (i.e. spawned by the selected values) are added to the parser. This also holds for the help message, which is
+            printed after the whole path has been parsed.
+        Children spawned by an ArgsGroup are parsed right after it, before its later siblings (see
+            parse_and_process_argsgroups).
         """
+        args = sys.argv[1:] if parse_str is None else parse_str.split()  # parse_str should be mainly for testing
+        help_wanted = any(arg in HELP_FLAGS for arg in args)
+        if help_wanted:
+            args = [arg for arg in args if arg not in HELP_FLAGS]
         parser = self.get_init_root_parser()
         # first add the args from root
         group = parser.add_argument_group(self.root.get_name(), self.root.get_description())
         self.root.add_children_args_to_parser(group)
         # then parse known args
-        if parse_str is None:
-            namespace, rem_args = parser.parse_known_args()
-        else:  # this case should be mainly for testing
-            namespace, rem_args = parser.parse_known_args(parse_str.split())
+        namespace, rem_args = parse_known_args_for_argsgroups([self.root], parser, args)
         # then we consume the args for the root
         self.root.process_and_consume_args_with_namespace(namespace)
-        # then add all args from children and parse
-        all_argsgroup_from_root_bfs = self.root.get_all_children_argsgroup(ordering='bfs')
-        for argsgroup in all_argsgroup_from_root_bfs:
-            rem_args = parse_and_process_argsgroup(argsgroup, parser, rem_args)
+        # then parse the children level by level as we discover them (including the ones spawned by the root)
+        rem_args = parse_argsgroups_level_by_level(list(self.root.get_children_argsgroup()), parser, rem_args)
 
+        if help_wanted:
+            parser.print_help()
+            parser.exit()
         if len(rem_args) > 0:
             raise argparse.ArgumentError(None, f"Too many args. See help below: "
                                                f"\n{parser.format_help()}")
@@ -85,11 +256,11 @@ class ArgParser:
         return parser
 
     @staticmethod
-    def get_init_root_parser(prog_name='fastr') -> argparse.ArgumentParser:
+    def get_init_root_parser(prog_name='fastr') -> LazyArgumentParser:
         description = """
         pipeline for ML/DL research in a modularized format that allows for easy modification and addition. 
         This repo also aims to minimize the amount of system configurations needed to start training."""
-        arg_parser = argparse.ArgumentParser(
+        arg_parser = LazyArgumentParser(
             prog=prog_name,
             description=description,
             allow_abbrev=False,
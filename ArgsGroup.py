@@ -1,9 +1,22 @@
 import argparse
+from collections import deque
 from Arg import Arg, ConfigType
 from DynamicDefaults import DynamicDefaults, DYNAMIC_DEFAULT_FLAG
-from dataclasses import is_dataclass
-from typing import Iterable, Tuple, List, Literal, Dict, ItemsView, Any, Union
-from graphviz import Digraph  # to visualize the ArgsGroup tree. Can be useful for debugging.
+from dataclasses import is_dataclass, fields
+from typing import Iterable, Tuple, List, Literal, Dict, ItemsView, Any, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:  # graphviz is only imported when drawing the tree (see draw_tree_from_me)
+    from graphviz import Digraph
+
+# attributes that are not children of an ArgsGroup (on top of the private ones). Add more attributes here to exclude.
+EXCLUDE_ATTRIBUTES = frozenset(['group_name', 'group_parent', 'group_description', 'field_name'])
+
+
+def is_sanitized_attribute(name: str) -> bool:
+    """
+    Returns whether the attribute name is a field of an ArgsGroup i.e. neither private nor in EXCLUDE_ATTRIBUTES.
+    """
+    return not name.startswith('_') and name not in EXCLUDE_ATTRIBUTES
 
 
 class ArgsGroup:
@@ -34,28 +47,83 @@ class ArgsGroup:
         - Dynamic default: a default that will be set at parsing time, where this default will be set depending on other
             args. E.g. optimizer=adamw is default if model=transformer vs. optimizer=adam if model=resnet50.
     """
+    # the children configs can be dataclasses with slots=True. We keep a __dict__ for the children ArgsGroup that are
+    # attached to the config after its construction (see spawn_args_children).
+    __slots__ = ('__dict__', 'group_name', 'group_description', '_group_parent', '_children_argsgroup', '_field_name',
+                 '_args_are_consumed', '_root_argsgroup', '_sanitized_attrs_cache', '_children_args_cache',
+                 '_all_children_cache', '_field_to_value_index', '_arg_fields', '_group_fields', '_config_fields',
+                 '_formatted_stats_cache')
+    # class-level defaults for __init__'s arguments. Set with class keywords, see __init_subclass__
+    _default_group_name = None
+    _default_group_description = None
+    _default_field_name = None
+
+    def __init_subclass__(cls, group_name=None, description=None, field_name=None, **kwargs):
+        """
+        Configs can give their name, description and field_name once in the class definition, e.g.
+            class ModelConfig(ArgsGroup, group_name="ModelConfig", description="Model related configs")
+        and then need no __post_init__ (see ArgsGroup.__post_init__).
+        """
+        super().__init_subclass__(**kwargs)
+        # only set the keywords that are given: subclasses inherit the others (dataclass(slots=True) also recreates
+        # the class without the keywords, but with the values already set in its __dict__)
+        if group_name is not None:
+            cls._default_group_name = group_name
+        if description is not None:
+            cls._default_group_description = description
+        if field_name is not None:
+            cls._default_field_name = field_name
 
     def __init__(self, name=None, description=None, field_name=None):
+        if name is None:
+            name = self._default_group_name
+        if description is None:
+            description = self._default_group_description
+        if field_name is None:
+            field_name = self._default_field_name
         assert name is not None, "Name for argsgroup should not be None"
+        assert is_dataclass(self), "Children of ArgsGroup should be of class dataclass"
         self.group_name = name
         self.group_description = description
 
         # private vars
         # parent ArgsGroup responsible for spawning this child ArgsGroup. If None then it is root.
         self._group_parent = None
-        self._children_argsgroup = []
+        self._children_argsgroup: Dict[str, 'ArgsGroup'] = {}  # field -> child ArgsGroup, in the order they are set
         self._field_name = field_name
         self._args_are_consumed = False
         self._root_argsgroup = None
+        # maps each field of the tree to the ArgsGroup that owns it. Only used by the root, see get_tree_field_index
+        self._field_to_value_index = None
+        # see get_sanitized_attributes_list. Reset by __setattr__ whenever a new attribute is added
+        self._sanitized_attrs_cache = None
+        # see get_children_args_fields_to_value. Reset by __setattr__ whenever an Arg is set or replaced
+        self._children_args_cache = None
+        # see get_all_children_argsgroup. Maps an ordering to the traversal. Reset whenever the subtree changes
+        self._all_children_cache = {}
+        # the sanitized attributes by kind: Arg, ArgsGroup and config. See _get_field_registries
+        self._arg_fields = None
+        self._group_fields = None
+        self._config_fields = None
+        # see format_stats. Reset by __setattr__ whenever the number of Args, configs or ArgsGroup can change
+        self._formatted_stats_cache = None
+
+    def __post_init__(self):
+        # called by the dataclass __init__ of configs that do not define their own __post_init__
+        ArgsGroup.__init__(self)
 
     @property
     def root_argsgroup(self) -> 'ArgsGroup':
         """
         Returns the root of the ArgsGroup tree. Similar to get_root_argsgroup() but implements as a property to avoid
             recomputation.
+        The root is found by walking up the parents once. It is then kept up to date by _set_parent.
         """
         if self._root_argsgroup is None:
-            super().__setattr__('_root_argsgroup', self.get_root_argsgroup())
+            root = self
+            while root._group_parent is not None:
+                root = root._group_parent
+            super().__setattr__('_root_argsgroup', root)
         return self._root_argsgroup
 
     def get_all_children_fields_to_values(self) -> Dict[str, Union[Arg, ConfigType]]:
@@ -63,6 +131,8 @@ class ArgsGroup:
         Returns a flat dictionary that contains all the children fields along with their value
             - Their values can either be an Arg, ArgsGroup, or a config (non-arg or non-argsgroup attribute)
         """
+        if self.get_parent_argsgroup() is None:  # the root's fields are already indexed
+            return {field: getattr(node, field) for field, node in self.get_tree_field_index().items()}
         result = self.get_children_fields_to_values()
         for child in self.get_all_children_argsgroup():
             result.update(child.get_children_fields_to_values())
@@ -73,22 +143,31 @@ class ArgsGroup:
         Returns a dictionary that contains the children fields along with their value
             - Their values are either an Arg or a config
         """
-        result = {}
-        for field in self.get_sanitized_attributes_list():
-            value = getattr(self, field)
-            # adds everything except ArgsGroup
-            if isinstance(value, ArgsGroup):
-                continue
-            result[field] = value
-        return result
+        _, group_fields, _ = self._get_field_registries()
+        # adds everything except ArgsGroup
+        return {field: getattr(self, field) for field in self.get_sanitized_attributes_list()
+                if field not in group_fields}
 
     def get_value_from_field_in_tree(self, field) -> Union[Arg, ConfigType]:
         """
         Given a field for either an Arg or config, search across the entire tree
         """
-        search_dict = self.root_argsgroup.get_all_children_fields_to_values()
-        assert field in search_dict, f"Field {field} not in ArgsGroup tree."
-        return search_dict[field]
+        index = self.get_tree_field_index()
+        assert field in index, f"Field {field} not in ArgsGroup tree."
+        return getattr(index[field], field)
+
+    def get_tree_field_index(self) -> Dict[str, 'ArgsGroup']:
+        """
+        Returns a dictionary that maps every field (Arg or config) in the tree to the ArgsGroup that owns it.
+        The index is stored on the root. It is built on the first call and then kept up to date by __setattr__.
+        """
+        root = self.root_argsgroup
+        if root._field_to_value_index is None:
+            index = {}
+            for node in [root] + root.get_all_children_argsgroup():
+                index.update(dict.fromkeys(node.get_children_fields_to_values(), node))
+            super(ArgsGroup, root).__setattr__('_field_to_value_index', index)
+        return root._field_to_value_index
 
     def add_children_args_to_parser(self, parser):
         """
@@ -103,9 +182,8 @@ class ArgsGroup:
         This is typically called after we finish parsing to set the remaining args so that we have a finished config
         """
         for field, arg in self.get_children_args_items():
-            # convert the value to the appropriate type if possible
-            value = arg.type(arg.default) if isinstance(arg.default, arg.type) else arg.default
-            setattr(self, field, value)
+            # the default is converted to the appropriate type once when the Arg is created
+            setattr(self, field, arg._default_coerced)
 
     def process_and_consume_args_with_namespace(self, namespace: argparse.Namespace) -> List['ArgsGroup']:
         """
@@ -119,17 +197,21 @@ class ArgsGroup:
             "_args_are_consumed is True! Should only call consume_args_with_argparse_namespace once after parsing."
         spawned_children_argsgroup = []
         children_args_dict = self.get_children_args_fields_to_value()
-        for field in vars(namespace):
-            assert field in children_args_dict, f"Invalid field {field} in namespace {namespace}"
-            value = getattr(namespace, field)
-            arg = children_args_dict[field]
+        # the values of the fields that dynamic defaults depend on (e.g. dataset). Each is looked up once per group
+        depending_values = {}
+        for field, value in vars(namespace).items():
+            try:
+                arg = children_args_dict[field]
+            except KeyError:
+                raise AssertionError(f"Invalid field {field} in namespace {namespace}")
             # process_value below performs type casting/checking and setting defaults
             if value == DYNAMIC_DEFAULT_FLAG:  # this means the user has not overridden the dynamic_default_flag
-                value = self.get_dynamic_default_for_arg(arg)
+                value = self.get_dynamic_default_for_arg(arg, depending_values)
             # then we sanitize the value (type casting, constraint checking, etc.)
             new_value = arg.sanitize_value_for_consumption(value)
             # now that we have a new value, we can spawn children if needed: attach to self and add to returned list
-            self.spawn_args_children(arg, new_value, spawned_children_argsgroup)
+            if arg._has_children:
+                self.spawn_args_children(arg, new_value, spawned_children_argsgroup)
             # finally we consume the arg and finish parsing it
             self.consume_arg(field, new_value)
         self.mark_self_as_parsed()
@@ -146,8 +228,9 @@ class ArgsGroup:
             spawned_child_argsgroup = child_argsgroup_to_spawn()
             childs_field_name = spawned_child_argsgroup.get_field_name()
             assert childs_field_name is not None, \
-                "Children argsgroup need to have a field_name init in config class def's ArgsGroup.__init__"
-            assert childs_field_name not in self.get_children_fields_to_values().keys(), \
+                "Children argsgroup need to have a field_name set in their class definition or ArgsGroup.__init__"
+            arg_fields, _, config_fields = self._get_field_registries()
+            assert childs_field_name not in arg_fields and childs_field_name not in config_fields, \
                 f"Children argsgroup's field_name (={childs_field_name}) already exists!"
             # attach the child to this group so the parent know the child
             setattr(self, childs_field_name, spawned_child_argsgroup)
@@ -156,19 +239,36 @@ class ArgsGroup:
     def get_field_name(self):
         return self._field_name
 
+    def are_args_consumed(self) -> bool:
+        """
+        Returns whether this ArgsGroup has been parsed i.e. its Args have been replaced by their values.
+        """
+        return self._args_are_consumed
+
     def mark_self_as_parsed(self):
         """
         Reset some properties after parsed
         """
         self._args_are_consumed = True
+        # the counts are final once the args are consumed
+        super().__setattr__('_formatted_stats_cache', self._compute_format_stats())
 
-    def get_dynamic_default_for_arg(self, arg: Arg):
+    def get_dynamic_default_for_arg(self, arg: Arg, depending_values: Dict[str, ConfigType] = None):
+        """
+        Returns the dynamic default of arg given the (consumed) value of the field it depends on.
+        depending_values can be passed to share the lookups of the depending fields across several Args: consumed
+            values do not change so a field found there is not searched in the tree again.
+        """
         assert isinstance(arg.dynamic_default, DynamicDefaults)
         # now we try to find the appropriate value
         default_field = arg.dynamic_default.default_field
+        if depending_values is not None and default_field in depending_values:
+            return arg.dynamic_default.get_dynamic_default(depending_values[default_field])
         default_value = self.get_value_from_field_in_tree(default_field)
         assert not isinstance(default_value, Arg), \
             f"Default field {default_field} must be consumed before setting dependent Arg {arg.get_name()}."
+        if depending_values is not None:
+            depending_values[default_field] = default_value
         return arg.dynamic_default.get_dynamic_default(default_value)
 
     def consume_arg(self, field, new_value):
@@ -190,73 +290,81 @@ class ArgsGroup:
     def get_all_children_argsgroup(self, ordering: Literal['dfs', 'bfs'] = 'dfs', reverse=False) -> List['ArgsGroup']:
         """
         Returns a list of args that are ArgsGroup in the specified ordering
+        The traversal is cached until an ArgsGroup is attached somewhere in the subtree (see _reset_all_children_cache)
         """
-        if ordering == 'dfs':
-            result = self._get_all_children_argsgroup_dfs()
-        elif ordering == 'bfs':
-            result = self._get_all_children_argsgroup_bfs()
-        else:
-            raise NotImplementedError(f"Unknown ordering: {ordering}")
-        if reverse:
-            result.reverse()
-        return result
+        if ordering not in self._all_children_cache:
+            if ordering == 'dfs':
+                traversal = self._get_all_children_argsgroup_dfs()
+            elif ordering == 'bfs':
+                traversal = self._get_all_children_argsgroup_bfs()
+            else:
+                raise NotImplementedError(f"Unknown ordering: {ordering}")
+            self._all_children_cache[ordering] = traversal
+        result = self._all_children_cache[ordering]
+        return result[::-1] if reverse else list(result)
+
+    def _reset_all_children_cache(self):
+        """
+        Resets the cached traversals of self and its ancestors since their subtrees contain self's.
+        """
+        node = self
+        while node is not None:
+            node._all_children_cache.clear()
+            node = node._group_parent
 
     def _get_all_children_argsgroup_dfs(self) -> List['ArgsGroup']:
-        my_children = self.get_children_argsgroup()
         result = []
-        for child in my_children:
+        stack = list(reversed(self.get_children_argsgroup()))
+        while stack:
+            child = stack.pop()
             result.append(child)
-            result.extend(child._get_all_children_argsgroup_dfs())
+            stack.extend(reversed(child.get_children_argsgroup()))
         return result
 
     def _get_all_children_argsgroup_bfs(self) -> List['ArgsGroup']:
-        from collections import deque
-        my_children = self.get_children_argsgroup()
-        visit_queue = deque(my_children)
+        visit_queue = deque(self._children_argsgroup.values())
         result = []
-        while len(visit_queue) > 0:
+        while visit_queue:
             child = visit_queue.popleft()
             result.append(child)
-            visit_queue.extend(child.get_children_argsgroup())
+            visit_queue.extend(child._children_argsgroup.values())
         return result
 
     def get_children_argsgroup(self) -> List['ArgsGroup']:
-        return self._children_argsgroup
+        return list(self._children_argsgroup.values())
 
     def get_children_args(self) -> List[Arg]:
         """
         Returns the current list of children args
         """
-        result = []
-        for field in self.get_sanitized_attributes_list():
-            value = getattr(self, field)
-            if isinstance(value, Arg):
-                result.append(value)
-        return result
+        return list(self.get_children_args_fields_to_value().values())
 
     def get_children_args_fields_to_value(self) -> Dict[str, Arg]:
         """
         Returns the dictionary containing key fields and value Arg
+        The dictionary is cached until an Arg is set or replaced (see __setattr__) so it should not be modified.
         """
-        result = {}
-        for field in self.get_sanitized_attributes_list():
-            value = getattr(self, field)
-            if isinstance(value, Arg):
-                result[field] = value
-        return result
+        if self._children_args_cache is None:
+            result = {}
+            for field in self.get_sanitized_attributes_list():
+                value = getattr(self, field)
+                if isinstance(value, Arg):
+                    result[field] = value
+            super().__setattr__('_children_args_cache', result)
+        return self._children_args_cache
 
     def get_all_children_configs_to_self(self) -> Dict[str, 'ArgsGroup']:
         """
         Recursively get all children configs dict with self. This is useful to set default values.
         Returns the dictionary containing key fields and value self for ALL children args.
         """
-        result = {field: self for field in self.get_configs_fields_list()}
-        for child in self.get_all_children_argsgroup():
-            childs_dict = {field: child for field in child.get_configs_fields_list()}
-            assert not (set(result.keys()) & set(childs_dict.keys())), \
-                ("We cannot call get_all_configs_to_self_dict if there are keys' collision.\n"
-                 f"result: {result.keys()}\nchilds_dict: {childs_dict.keys()}")
-            result.update(childs_dict)
+        result = {}
+        for node in [self] + self.get_all_children_argsgroup():
+            for field in node.get_configs_fields_list():
+                assert field not in result, \
+                    ("We cannot call get_all_configs_to_self_dict if there are keys' collision.\n"
+                     f"{field} is in both {result[field].get_name()} and {node.get_name()}")
+                result[field] = node
         return result
 
     def get_configs_to_value(self) -> Dict[str, Any]:
@@ -316,11 +424,9 @@ class ArgsGroup:
 
     def get_root_argsgroup(self):
         """
-        Return the root argsgroup.
+        Return the root argsgroup. See root_argsgroup.
         """
-        if self.get_parent_argsgroup() is None:
-            return self
-        return self.get_parent_argsgroup().get_root_argsgroup()
+        return self.root_argsgroup
 
     def format_attributes(self, include_children_argsgroup=True) -> str:
         """
@@ -330,30 +436,30 @@ class ArgsGroup:
         parent_name = self.get_parent_argsgroup().get_name() if self.get_parent_argsgroup() is not None else 'ROOT'
         parent_str = f"{parent_name}" if parent_name == "ROOT" else f"parent: {parent_name}"
         description = f"{self.get_description()}\n\t*** {self.format_stats()} ***"
-        result_str = f"{name} ({parent_str}): {description}\n"
+        result = [f"{name} ({parent_str}): {description}\n"]
         for field in self.get_sanitized_attributes_list():
             value = getattr(self, field)
             if isinstance(value, Arg):
-                result_str += f"\t(Arg)\t{value.format_description()}"
+                result.append(f"\t(Arg)\t{value.format_description()}")
             elif isinstance(value, ArgsGroup):
                 if include_children_argsgroup:
-                    result_str += f"\t(ArgsGroup) {value.format_description()}\n"
+                    result.append(f"\t(ArgsGroup) {value.format_description()}\n")
             else:
-                if value is None:
-                    result_str += f"\t[None]"
-                else:
-                    result_str += f"\t[{type(value).__name__}]"
-                result_str += f"\t{field}:\t"
-                result_str += f"{str(value)}"
-                result_str += "\n"
-        result_str += "\n"
-        return result_str
+                type_name = "None" if value is None else type(value).__name__
+                result.append(f"\t[{type_name}]\t{field}:\t{str(value)}\n")
+        result.append("\n")
+        return "".join(result)
 
     def format_description(self):
         result = self.get_name() if self.get_field_name() is None else self.get_field_name()
         return f"{result}:\t{self.format_stats()}"
 
     def format_stats(self):
+        if self._formatted_stats_cache is None:
+            super().__setattr__('_formatted_stats_cache', self._compute_format_stats())
+        return self._formatted_stats_cache
+
+    def _compute_format_stats(self):
         num_args = self.get_num_args()
         result = f"{num_args} Args, " if num_args > 0 else ""
         noncfg_str = "non-Arg configs" if num_args > 0 else "configs"
@@ -367,12 +473,11 @@ class ArgsGroup:
         String representation of ArgsGroup consists of the flattened out verion of all the args and nested ArgsGroup.
         The args are grouped the by ArgsGroup.
         """
-        result_str = self.format_attributes(include_children_argsgroup)
-        children_args_group = self.get_all_children_argsgroup(ordering=ordering)
-        for child in children_args_group:
+        result = [self.format_attributes(include_children_argsgroup)]
+        for child in self.get_all_children_argsgroup(ordering=ordering):
             assert isinstance(child, ArgsGroup)
-            result_str += child.format_attributes(include_children_argsgroup)
-        return result_str
+            result.append(child.format_attributes(include_children_argsgroup))
+        return "".join(result)
 
     def __str__(self):
         return self.format_attributes(include_children_argsgroup=True)
@@ -384,30 +489,23 @@ class ArgsGroup:
         Return: A tuple of (self, field, Arg). We return self because it might be useful to know which field belongs
             to which ArgsGroup. This allows for potential modification of Arg during parsing.
         """
-        children_args_group = []
-        for field in self.get_sanitized_attributes_list():
-            value = getattr(self, field)
-            if isinstance(value, Arg):
-                yield self, field, value
-            elif isinstance(value, ArgsGroup):
-                children_args_group.append(value)
-        for child in children_args_group:
-            yield from child.get_all_self_field_arg()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for field, arg in node.get_children_args_items():
+                yield node, field, arg
+            stack.extend(reversed(node.get_children_argsgroup()))
 
     def get_configs_fields_list(self) -> List[str]:
         """
         Return a list of fields of ArgsGroup where the fields are neither Arg nor ArgsGroup
         """
-        tmp = [field for field in self.get_sanitized_attributes_list()]
-
-        def nonargs_and_argsgroup(x):
-            return not (isinstance(getattr(self, x), Arg) or isinstance(getattr(self, x), ArgsGroup))
-
-        result = filter(nonargs_and_argsgroup, tmp)
-        return list(result)
+        _, _, config_fields = self._get_field_registries()
+        return [field for field in self.get_sanitized_attributes_list() if field in config_fields]
 
     def get_num_configs(self) -> int:
-        return len(self.get_configs_fields_list())
+        _, _, config_fields = self._get_field_registries()
+        return len(config_fields)
 
     def get_name(self):
         return self.group_name
@@ -417,39 +515,127 @@ class ArgsGroup:
 
     def get_sanitized_attributes_list(self) -> List[str]:
         """
-        Returns a sanitized list of fields defined by the exclude_attributes list below.
+        Returns a sanitized list of fields i.e. the attributes that are neither private nor in EXCLUDE_ATTRIBUTES.
+            These are the dataclass fields followed by the attributes set afterwards (e.g. children ArgsGroup).
+        The list is cached until a new attribute is set (see __setattr__) so it should not be modified.
         """
-        assert is_dataclass(self), "Children of ArgsGroup should be of class dataclass"
-        # add more attributes below to exclude
-        exclude_attributes = ['group_name', 'group_parent', 'group_description', 'field_name']
+        if self._sanitized_attrs_cache is None:
+            attributes = dict.fromkeys(field.name for field in self.get_dataclass_fields())
+            attributes.update(dict.fromkeys(vars(self)))
+            super().__setattr__('_sanitized_attrs_cache', [
+                field for field in attributes if is_sanitized_attribute(field)])
+        return self._sanitized_attrs_cache
 
-        def filter_attributes(val) -> bool:
-            if val in exclude_attributes:
-                return False
-            if val[0] == '_':  # exclude private attributes
-                return False
-            return True
+    @classmethod
+    def get_dataclass_fields(cls) -> tuple:
+        """
+        Same as dataclasses.fields(cls) but computed once per config class and stored on it as _CACHED_FIELDS.
+        """
+        if '_CACHED_FIELDS' not in cls.__dict__:  # not inherited: a subclass can declare more fields
+            cls._CACHED_FIELDS = fields(cls)
+        return cls._CACHED_FIELDS
 
-        result = list(filter(filter_attributes, vars(self).keys()))
-        return result
+    def _get_field_registries(self) -> Tuple[set, set, set]:
+        """
+        Returns the sets of sanitized fields whose value is an Arg, an ArgsGroup and a config respectively.
+        The sets are built on the first call (fields can be set before ArgsGroup.__init__) then kept up to date by
+            __setattr__. They are unordered: iterate over get_sanitized_attributes_list to keep the fields' order.
+        """
+        if self._config_fields is None:
+            arg_fields, group_fields, config_fields = set(), set(), set()
+            for field in self.get_sanitized_attributes_list():
+                value = getattr(self, field)
+                if isinstance(value, Arg):
+                    arg_fields.add(field)
+                elif isinstance(value, ArgsGroup):
+                    group_fields.add(field)
+                else:
+                    config_fields.add(field)
+            super().__setattr__('_arg_fields', arg_fields)
+            super().__setattr__('_group_fields', group_fields)
+            super().__setattr__('_config_fields', config_fields)
+        return self._arg_fields, self._group_fields, self._config_fields
+
+    def _update_field_registries(self, name, value):
+        """
+        Moves the field name to the registry of value's kind. E.g. when an Arg is consumed, it becomes a config.
+        """
+        self._arg_fields.discard(name)
+        self._group_fields.discard(name)
+        self._config_fields.discard(name)
+        if isinstance(value, Arg):
+            self._arg_fields.add(name)
+        elif isinstance(value, ArgsGroup):
+            self._group_fields.add(name)
+        else:
+            self._config_fields.add(name)
 
     def _set_parent(self, parent):
         assert self._group_parent is None, "This method should be called only once. When do we want to change parents?"
         # we must call super's setattr otherwise we will loop.
         super().__setattr__('_group_parent',  parent)
+        # push the root down the subtree so that no node has to walk up its parents
+        self._set_root_argsgroup(parent.root_argsgroup)
+
+    def _set_root_argsgroup(self, root):
+        super().__setattr__('_root_argsgroup', root)
+        for child in self.get_children_argsgroup():
+            child._set_root_argsgroup(root)
+
+    def __setstate__(self, state):
+        """
+        Restores the state given by object.__getstate__ (used by pickle and copy): the __dict__ and the slots.
+        The slots are set with object.__setattr__ since __setattr__ below needs the private attributes being restored.
+        """
+        dict_state, slots_state = state if isinstance(state, tuple) else (state, None)
+        if dict_state:
+            self.__dict__.update(dict_state)
+        for name, value in (slots_state or {}).items():
+            object.__setattr__(self, name, value)
 
     def __setattr__(self, name, value):
+        is_new_attribute = name not in self.__dict__
+        replaces_arg = isinstance(getattr(self, name, None), Arg)
         # Call the original __setattr__ to set the attribute
         super().__setattr__(name, value)
+        # slots (including the fields of a slots=True dataclass) are never new attributes
+        is_new_attribute = is_new_attribute and name in self.__dict__
+        # reset the caches that depend on the attributes. Note that this can happen before ArgsGroup.__init__
+        if is_new_attribute:
+            super().__setattr__('_sanitized_attrs_cache', None)
+        if replaces_arg or isinstance(value, Arg):
+            super().__setattr__('_children_args_cache', None)
+        if is_new_attribute or replaces_arg or isinstance(value, (Arg, ArgsGroup)):
+            super().__setattr__('_formatted_stats_cache', None)
+        if getattr(self, '_config_fields', None) is not None and is_sanitized_attribute(name):
+            self._update_field_registries(name, value)
 
         # If the attribute being set is an instance of ArgsGroup
         if isinstance(value, ArgsGroup):
-            # Add the child to the current instance's children list
-            self._children_argsgroup.append(value)
+            # Add the child to the current instance's children (replacing the previous child with that field if any)
+            previous_child = self._children_argsgroup.get(name)
+            if previous_child is value:
+                return
+            self._children_argsgroup[name] = value
             # Set the parent of the child to the current instance
             value._set_parent(self)
-
-    def draw_tree_from_me(self, dot=None) -> Digraph:
+            self._reset_all_children_cache()
+            root = self.root_argsgroup
+            if previous_child is not None:
+                # the previous subtree's fields are still in the tree's index so we rebuild it on demand
+                super(ArgsGroup, root).__setattr__('_field_to_value_index', None)
+            # register the fields of the new subtree in the tree's index (if it has been built)
+            index = root._field_to_value_index
+            if index is not None:
+                for node in [value] + value.get_all_children_argsgroup():
+                    index.update(dict.fromkeys(node.get_children_fields_to_values(), node))
+        elif is_new_attribute and is_sanitized_attribute(name) and hasattr(self, '_field_to_value_index'):
+            # a new field of an initialized ArgsGroup: register it in the tree's index (if it has been built)
+            index = self.root_argsgroup._field_to_value_index
+            if index is not None:
+                index[name] = self
+
+    def draw_tree_from_me(self, dot=None) -> 'Digraph':
         """
         Uses graphviz library to draw the ArgsGroup tree where each node contains the name of the ArgsGroup.
         To use the returned Digraph, run:
@@ -458,6 +644,7 @@ class ArgsGroup:
         where root_conf is the root ArgsGroup.
         """
         if dot is None:
+            from graphviz import Digraph  # to visualize the ArgsGroup tree. Can be useful for debugging.
             dot = Digraph(comment="Tree visualization")
         dot.node(self.get_name(), label=f"{self.get_name()}\n{self.format_stats()}")
         for child in self.get_children_argsgroup():
@@ -467,10 +654,4 @@ class ArgsGroup:
 
 
 def pretty_str_list_of_argsgroup(agl: List['ArgsGroup']) -> str:
-    if len(agl) == 0:
-        return "[]"
-    result = f"[{agl[0].get_name()}"
-    for i in range(1, len(agl)):
-        result += f", {agl[i].get_name()}"
-    result += "]"
-    return result
+    return "[" + ", ".join(argsgroup.get_name() for argsgroup in agl) + "]"
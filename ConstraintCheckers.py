@@ -9,76 +9,161 @@ class ConstraintChecker(ABC):
     Base class for all the constraint functions.
     This provides simple template to create functions that checks and prints out appropriate message and warning
     """
+    __slots__ = ()
+
     @abstractmethod
     def __call__(self, value):
         pass
 
+    def as_function(self):
+        """
+        Returns a plain function that performs the same check as calling this checker. Subclasses return a closure
+            specialized for their bounds, which is cheaper to call than __call__ (used by Arg's sanitizer on every parse).
+        """
+        return self
+
 
 class LowerBoundChecker(ConstraintChecker):
+    __slots__ = ('lower_bound', 'strict')
+
     def __init__(self, lower_bound, strict=False):
         self.lower_bound = lower_bound
         self.strict = strict
 
     def __call__(self, value):
-        if self.strict and value <= self.lower_bound:
-            raise ValueError(f"Value {value} is less than or equal to the lower bound {self.lower_bound}")
-        elif not self.strict and value < self.lower_bound:
+        # a single test when the value is valid. strict only picks the error message after that
+        if value <= self.lower_bound if self.strict else value < self.lower_bound:
+            if self.strict:
+                raise ValueError(f"Value {value} is less than or equal to the lower bound {self.lower_bound}")
             raise ValueError(f"Value {value} is less than the lower bound {self.lower_bound}")
         return value
 
+    def as_function(self):
+        return _lower_bound_check_fn(self.lower_bound, self.strict)
+
 
 class UpperBoundChecker(ConstraintChecker):
+    __slots__ = ('upper_bound', 'strict')
+
     def __init__(self, upper_bound, strict=False):
         self.upper_bound = upper_bound
         self.strict = strict
 
     def __call__(self, value):
-        if self.strict and value >= self.upper_bound:
-            raise ValueError(f"Value {value} is greater than or equal to the upper bound {self.upper_bound}")
-        elif not self.strict and value > self.upper_bound:
+        if value >= self.upper_bound if self.strict else value > self.upper_bound:
+            if self.strict:
+                raise ValueError(f"Value {value} is greater than or equal to the upper bound {self.upper_bound}")
             raise ValueError(f"Value {value} is greater than the upper bound {self.upper_bound}")
         return value
 
+    def as_function(self):
+        return _upper_bound_check_fn(self.upper_bound, self.strict)
+
 
 class CompositeConstraintChecker(ConstraintChecker):
+    __slots__ = ('lower_bounds', 'upper_bounds', '_lo', '_lo_strict', '_hi', '_hi_strict')
+
     def __init__(self, checkers):
-        self.checkers = []
         self.lower_bounds = []
         self.upper_bounds = []
+        # the tightest bounds, reduced in a single pass. None means there is no such bound (the bounds can be any
+        # comparable values, so there is no sentinel that compares with all of them). At equal bounds the strict one
+        # is tighter
+        lo, lo_strict, hi, hi_strict = None, False, None, False
 
         for checker in checkers:
             if isinstance(checker, LowerBoundChecker):
-                self.lower_bounds.append((checker.lower_bound, checker.strict))
+                bound, strict = checker.lower_bound, checker.strict
+                self.lower_bounds.append((bound, strict))
+                if lo is None or bound > lo:
+                    lo, lo_strict = bound, strict
+                elif bound == lo:
+                    lo_strict = lo_strict or strict
             elif isinstance(checker, UpperBoundChecker):
-                self.upper_bounds.append((checker.upper_bound, checker.strict))
-
-        self.lower_bounds.sort(key=lambda x: (x[0], not x[1]))
-        self.upper_bounds.sort(key=lambda x: (x[0], x[1]))
-
-        if self.lower_bounds and self.upper_bounds:
-            max_lower_bound, max_lower_strict = self.lower_bounds[-1]
-            min_upper_bound, min_upper_strict = self.upper_bounds[0]
-
-            if max_lower_bound >= min_upper_bound:
-                if max_lower_strict and min_upper_strict:
-                    raise ValueError(
-                        f"Incompatible constraints: lower bound {max_lower_bound} >= upper bound {min_upper_bound}")
-                elif max_lower_strict and not min_upper_strict:
-                    raise ValueError(
-                        f"Incompatible constraints: lower bound {max_lower_bound} > upper bound {min_upper_bound}")
-                elif not max_lower_strict and min_upper_strict:
-                    raise ValueError(
-                        f"Incompatible constraints: lower bound {max_lower_bound} >= upper bound {min_upper_bound}")
-
-        if self.lower_bounds:
-            max_lower_bound, strict = self.lower_bounds[-1]
-            self.checkers.append(LowerBoundChecker(max_lower_bound, strict))
-
-        if self.upper_bounds:
-            min_upper_bound, strict = self.upper_bounds[0]
-            self.checkers.append(UpperBoundChecker(min_upper_bound, strict))
+                bound, strict = checker.upper_bound, checker.strict
+                self.upper_bounds.append((bound, strict))
+                if hi is None or bound < hi:
+                    hi, hi_strict = bound, strict
+                elif bound == hi:
+                    hi_strict = hi_strict or strict
+
+        # no value satisfies both bounds
+        if lo is not None and hi is not None:
+            if lo > hi:
+                raise ValueError(f"Incompatible constraints: lower bound {lo} > upper bound {hi}")
+            if lo == hi and (lo_strict or hi_strict):
+                raise ValueError(f"Incompatible constraints: lower bound {lo} >= upper bound {hi}")
+
+        # the collapsed bounds that are checked in __call__
+        self._lo, self._lo_strict = lo, lo_strict
+        self._hi, self._hi_strict = hi, hi_strict
 
     def __call__(self, value):
-        for checker in self.checkers:
-            value = checker(value)
+        if self._lo is not None and (value <= self._lo if self._lo_strict else value < self._lo):
+            if self._lo_strict:
+                raise ValueError(f"Value {value} is less than or equal to the lower bound {self._lo}")
+            raise ValueError(f"Value {value} is less than the lower bound {self._lo}")
+        if self._hi is not None and (value >= self._hi if self._hi_strict else value > self._hi):
+            if self._hi_strict:
+                raise ValueError(f"Value {value} is greater than or equal to the upper bound {self._hi}")
+            raise ValueError(f"Value {value} is greater than the upper bound {self._hi}")
         return value
+
+    @property
+    def checkers(self):
+        # the collapsed bounds as checkers: the tightest lower bound, then the tightest upper bound
+        checkers = []
+        if self._lo is not None:
+            checkers.append(LowerBoundChecker(self._lo, self._lo_strict))
+        if self._hi is not None:
+            checkers.append(UpperBoundChecker(self._hi, self._hi_strict))
+        return checkers
+
+    def as_function(self):
+        # a missing bound needs no check at all
+        if self._lo is None and self._hi is None:
+            return _no_check_fn
+        if self._hi is None:
+            return _lower_bound_check_fn(self._lo, self._lo_strict)
+        if self._lo is None:
+            return _upper_bound_check_fn(self._hi, self._hi_strict)
+        check_lower = _lower_bound_check_fn(self._lo, self._lo_strict)
+        check_upper = _upper_bound_check_fn(self._hi, self._hi_strict)
+
+        def check(value):
+            return check_upper(check_lower(value))
+        return check
+
+
+def _no_check_fn(value):
+    return value
+
+
+def _lower_bound_check_fn(lower_bound, strict):
+    # same checks and messages as LowerBoundChecker.__call__ with strict resolved once
+    if strict:
+        def check(value):
+            if value <= lower_bound:
+                raise ValueError(f"Value {value} is less than or equal to the lower bound {lower_bound}")
+            return value
+    else:
+        def check(value):
+            if value < lower_bound:
+                raise ValueError(f"Value {value} is less than the lower bound {lower_bound}")
+            return value
+    return check
+
+
+def _upper_bound_check_fn(upper_bound, strict):
+    # same checks and messages as UpperBoundChecker.__call__ with strict resolved once
+    if strict:
+        def check(value):
+            if value >= upper_bound:
+                raise ValueError(f"Value {value} is greater than or equal to the upper bound {upper_bound}")
+            return value
+    else:
+        def check(value):
+            if value > upper_bound:
+                raise ValueError(f"Value {value} is greater than the upper bound {upper_bound}")
+            return value
+    return check
@@ -1,12 +1,47 @@
-from dataclasses import dataclass
-from typing import List, Tuple, Dict, NewType, Union
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Tuple, Dict, Mapping, NewType, Union
 
 
 ConfigType = NewType('ConfigType', Union[int, float, bool, str])
-DYNAMIC_DEFAULT_FLAG = object()  # flag object to set dynamic default
 
 
-@dataclass
+class _DynamicDefaultFlag:
+    """
+    Type of DYNAMIC_DEFAULT_FLAG. The flag is compared by identity so it is pickled and copied by reference: the Args
+        of a copied or unpickled config still hold the same flag.
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        return 'DYNAMIC_DEFAULT_FLAG'
+
+
+DYNAMIC_DEFAULT_FLAG = _DynamicDefaultFlag()  # flag object to set dynamic default
+
+
+def _build_default_dict(default_map) -> Mapping[ConfigType, ConfigType]:
+    """
+    Flattens a default_map (see DynamicDefaults) into a read-only dict from each depending value to its default.
+    """
+    default_dict = {}
+    for values, default in default_map:
+        default_dict.update({value: default for value in values})
+    return MappingProxyType(default_dict)
+
+
+@lru_cache(maxsize=None)
+def _build_cached_default_dict(default_map: tuple, default_types: tuple) -> Mapping[ConfigType, ConfigType]:
+    """
+    Same as _build_default_dict but identical default_maps (e.g. built from the same default_dict) share their flattened
+        dict. The types of the defaults are part of the key since equal defaults of different types (e.g. True and 1)
+        would otherwise share the dict of whichever was built first.
+    """
+    return _build_default_dict(default_map)
+
+
+@dataclass(slots=True)
 class DynamicDefaults:
     """
     Class to store information for handling dynamic defaults
@@ -24,19 +59,24 @@ class DynamicDefaults:
     default_map: List[Tuple[Tuple, ConfigType]]  # contains pairs of mapping
     # private attributes
     _dynamic_default_field_str = 'dynamic_default_field'
+    _default_dict: Mapping[ConfigType, ConfigType] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self._default_dict = {}
-        for values, default in self.default_map:
-            self._default_dict.update({value: default for value in values})
+        try:
+            self._default_dict = _build_cached_default_dict(
+                tuple(self.default_map), tuple(type(default) for _, default in self.default_map))
+        except TypeError:  # the default_map contains unhashable values so we cannot cache it
+            self._default_dict = _build_default_dict(self.default_map)
+
+    def __reduce__(self):
+        # used by pickle and copy. The read-only _default_dict cannot be pickled so it is rebuilt by __post_init__
+        return type(self), (self.default_field, self.fallback_value, self.default_map)
 
     def get_dynamic_default(self, depending_value) -> ConfigType:
         """
         Given the depending value, returns the corresponding dynamic default.
         """
-        if depending_value in self._default_dict:
-            return self._default_dict[depending_value]
-        return self.fallback_value
+        return self._default_dict.get(depending_value, self.fallback_value)
 
     @staticmethod
     def get_default_map_from_default_dict(
@@ -46,16 +86,15 @@ class DynamicDefaults:
         """
         Given a default_dict, create a default_map for all the arg_name
         """
-        from collections import defaultdict
-        tmp = defaultdict(list)
+        tmp = {}  # maps each default value to the depending values that select it
         for k, v in default_dict.items():
             if k == DynamicDefaults._dynamic_default_field_str:
                 # this is metadata so we skip
                 continue
             if isinstance(v, dict):
-                if arg_name in v:
-                    # if value is a dict we only get the value for the arg_name
-                    tmp[v[arg_name]].append(k)
-            else:
-                tmp[v].append(k)
+                if arg_name not in v:
+                    continue
+                # if value is a dict we only get the value for the arg_name
+                v = v[arg_name]
+            tmp.setdefault(v, []).append(k)
         return [(tuple(v), k) for k, v in tmp.items()]
@@ -8,15 +8,15 @@ from example.TrainerConfig import TrainerConfig
 from example.DatasetConfig import DatasetConfig
 
 
-@dataclass
-class MainConfig(ArgsGroup):
+@dataclass(slots=True)
+class MainConfig(ArgsGroup, group_name="MainConfig", description="Main Configs for the project"):
     """
     Root config for project
     """
 
     def __post_init__(self):
         # parent=None means I am the root
-        ArgsGroup.__init__(self, "MainConfig", "Main Configs for the project")
+        ArgsGroup.__post_init__(self)
         # the ordering of these children configs matter because of default creation dependency
         self.dataset_config: DatasetConfig = DatasetConfig()
         self.model_config: ModelConfig = ModelConfig()
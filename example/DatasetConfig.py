@@ -4,17 +4,20 @@ from ArgsGroup import ArgsGroup
 from example.global_vars import default_data_setting_dict
 
 
-AVAIL_DATASETS = ['mnist', 'cifar10', 'wikitext', 'sst2', 'imdb', 'mrpc', 'mnli']
+AVAIL_DATASETS = ('mnist', 'cifar10', 'wikitext', 'sst2', 'imdb', 'mrpc', 'mnli')
 MAX_NUM_WORKERS = 4
 
+_HELP_N_ACCUMULATE_BATCHES = (
+    'Set this number greater than 1 in order to accumulate gradients across multiple batches before taking an '
+    'optimizer step. For example, if your hardware cannot handle a batch_size of 32 but you want to step with '
+    'batch_size 32, you can instead set (batch_size=16 and acc_steps=2) or (batch_size=8 and acc_steps=4) or '
+    'any other combinations to get the same effect. The only downside is that you will lose parallelization. '
+)
 
-@dataclass
-class DatasetConfig(ArgsGroup):
-
-    def __post_init__(self):
-        ArgsGroup.__init__(
-            self, "DatasetConfig", "Arguments for data loading and preprocessing")
 
+@dataclass(slots=True)
+class DatasetConfig(ArgsGroup, group_name="DatasetConfig",
+                    description="Arguments for data loading and preprocessing"):
     dataset: str = StrArg(
         "dataset", choices=AVAIL_DATASETS, default='cifar10'
     )
@@ -36,10 +39,7 @@ class DatasetConfig(ArgsGroup):
     )
     n_accumulate_batches: int = IntArg(
         "n_accumulate_batches", default=1,
-        help='Set this number greater than 1 in order to accumulate gradients across multiple batches before taking an '
-             'optimizer step. For example, if your hardware cannot handle a batch_size of 32 but you want to step with '
-             'batch_size 32, you can instead set (batch_size=16 and acc_steps=2) or (batch_size=8 and acc_steps=4) or '
-             'any other combinations to get the same effect. The only downside is that you will lose parallelization. ',
+        help=_HELP_N_ACCUMULATE_BATCHES,
         dynamic_defaults_dict=default_data_setting_dict
     )
     no_augment_data: bool = BoolArg(
@@ -6,12 +6,12 @@ from example.global_vars import default_data_setting_dict
 from example.GradProcessingConfig import GradProcessingConfig
 
 
-@dataclass(kw_only=True)
-class EpochRunnerConfig(ArgsGroup):
+@dataclass(kw_only=True, slots=True)
+class EpochRunnerConfig(ArgsGroup, group_name="EpochRunnerConfig",
+                        description="Arguments for the main training loop (EpochRunner)"):
 
     def __post_init__(self):
-        ArgsGroup.__init__(
-            self, "EpochRunnerConfig", "Arguments for the main training loop (EpochRunner)")
+        ArgsGroup.__post_init__(self)
         # children configs
         self.grad_processing_config = GradProcessingConfig()
 
@@ -4,13 +4,12 @@ from Arg import IntArg
 from example.global_vars import default_data_setting_dict
 
 
-@dataclass
-class GPTBaseConfigs(ArgsGroup):
+@dataclass(slots=True)
+class GPTBaseConfigs(ArgsGroup, group_name="GPTBaseConfigs", description="GPTBase models' configs"):
     field_name: str = 'gpt_base_configs'
 
     def __post_init__(self):
-        ArgsGroup.__init__(self, "GPTBaseConfigs", "GPTBase models' configs",
-                           field_name=self.field_name)
+        ArgsGroup.__init__(self, field_name=self.field_name)
 
     vocab_size: int = 50304
     n_embd: int = 768
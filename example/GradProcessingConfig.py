@@ -3,13 +3,8 @@ from Arg import FloatArg
 from ArgsGroup import ArgsGroup
 
 
-@dataclass(kw_only=True)
-class GradProcessingConfig(ArgsGroup):
-
-    def __post_init__(self):
-        ArgsGroup.__init__(
-            self, "GradProcessingConfig", "Gradient Processing Configs")
-
+@dataclass(kw_only=True, slots=True)
+class GradProcessingConfig(ArgsGroup, group_name="GradProcessingConfig", description="Gradient Processing Configs"):
     # gradient clipping and adding noise
     scale_noise: float = FloatArg(
         "scale_noise", default=1,
@@ -3,15 +3,18 @@ from Arg import IntArg, StrArg, BoolArg
 from ArgsGroup import ArgsGroup
 from example.global_vars import default_data_setting_dict
 from ConstraintCheckers import LowerBoundChecker
-from example.ProfilerConfig import ProfilerConfig
 
 
-@dataclass
-class LoggingConfig(ArgsGroup):
+_HELP_LOG_FIXED_GRADIENTS_N_EPOCHS = (
+    "The frequency (in epoch) to log gradients of batches as a epoch on its own."
+    "Set this to > 0 to activate. For example, 1 would mean log gradients every epoch."
+    "Enabling this would always log an epoch of gradients before training begins."
+    "This will be more time consuming than log_gradients because of the additional epochs."
+)
 
-    def __post_init__(self):
-        ArgsGroup.__init__(self, "LoggingConfig", "Logging related configs")
 
+@dataclass(slots=True)
+class LoggingConfig(ArgsGroup, group_name="LoggingConfig", description="Logging related configs"):
     # should this inherit from LoggerConfig so that we can move the logging config to the logger?
     log_dir: str = StrArg(
         "log_dir", default="AUTO",
@@ -19,10 +22,7 @@ class LoggingConfig(ArgsGroup):
     )
     log_fixed_gradients_n_epochs: int = IntArg(
         "log_fixed_gradients_n_epochs", default=0, type=int,
-        help="The frequency (in epoch) to log gradients of batches as a epoch on its own."
-             "Set this to > 0 to activate. For example, 1 would mean log gradients every epoch."
-             "Enabling this would always log an epoch of gradients before training begins."
-             "This will be more time consuming than log_gradients because of the additional epochs."
+        help=_HELP_LOG_FIXED_GRADIENTS_N_EPOCHS
     )
     run_test_only_if_best_metric_split_improved: bool = BoolArg(
         "run_test_only_if_best_metric_split_improved", action="store_true", default=False,
@@ -49,5 +49,5 @@ class LoggingConfig(ArgsGroup):
         "run_profiler", default=False, action="store_true",
         help="Turn on the profiler to profile for a set number of batches. "
              "See additional configs for profiler to control scheduler.",
-        children_args={True: ProfilerConfig}
+        children_args={True: "example.ProfilerConfig:ProfilerConfig"}  # only imported when the profiler is on
     )
@@ -5,14 +5,11 @@ from ArgsGroup import ArgsGroup
 from example.global_vars import default_data_setting_dict
 
 
-AVAIL_MODELS = ['resnet50', 'gptbase', 'bert']
+AVAIL_MODELS = ('resnet50', 'gptbase', 'bert')
 
 
-@dataclass
-class ModelConfig(ArgsGroup):
-    def __post_init__(self):
-        ArgsGroup.__init__(self, "ModelConfig", "Model related configs")
-
+@dataclass(slots=True)
+class ModelConfig(ArgsGroup, group_name="ModelConfig", description="Model related configs"):
     model: str = StrArg(
         "model", choices=AVAIL_MODELS, default='resnet50',
         dynamic_defaults_dict=default_data_setting_dict,
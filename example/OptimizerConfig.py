@@ -5,15 +5,11 @@ from example.global_vars import default_data_setting_dict
 from ArgsGroup import ArgsGroup
 
 
-AVAIL_OPTIMIZERS = ['sgd', 'adam', 'adamw']
+AVAIL_OPTIMIZERS = ('sgd', 'adam', 'adamw')
 
 
-@dataclass
-class OptimizerConfig(ArgsGroup):
-
-    def __post_init__(self):
-        ArgsGroup.__init__(self, "OptimizerConfig", "Optimizer related configs")
-
+@dataclass(slots=True)
+class OptimizerConfig(ArgsGroup, group_name="OptimizerConfig", description="Optimizer related configs"):
     optimizer: str = StrArg(
         "optimizer", choices=AVAIL_OPTIMIZERS, default='sgd',
         dynamic_defaults_dict=default_data_setting_dict
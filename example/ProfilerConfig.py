@@ -3,12 +3,9 @@ from Arg import IntArg
 from ArgsGroup import ArgsGroup
 
 
-@dataclass
-class ProfilerConfig(ArgsGroup):
-    def __post_init__(self):
-        ArgsGroup.__init__(self, "ProfilerConfig", "Configs related to profiling runs",
-                           field_name="profiler_config")
-
+@dataclass(slots=True)
+class ProfilerConfig(ArgsGroup, group_name="ProfilerConfig", description="Configs related to profiling runs",
+                     field_name="profiler_config"):
     wait: int = 5
     warmup: int = 2
     active: int = 3
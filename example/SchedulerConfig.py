@@ -4,23 +4,22 @@ from ArgsGroup import ArgsGroup
 from example.global_vars import default_data_setting_dict, default_scheduler_setting_dict
 
 
-AVAIL_SCHEDULERS = ['linear', 'one_cycle', 'cos', 'reduce_lr_on_plateau']
+AVAIL_SCHEDULERS = ('linear', 'one_cycle', 'cos', 'reduce_lr_on_plateau')
 
 
-@dataclass
-class OneCycleLRConfig(ArgsGroup):
+@dataclass(slots=True)
+class OneCycleLRConfig(ArgsGroup, group_name="OneCycleLRConfig", description="OneCycleLR scheduler related configs"):
     field_name: str = 'one_cycle'
 
     def __post_init__(self):
-        ArgsGroup.__init__(self, "OneCycleLRConfig", "OneCycleLR scheduler related configs",
-                           field_name=self.field_name)
+        ArgsGroup.__init__(self, field_name=self.field_name)
 
     max_lr: float = FloatArg(
         "max_lr", default=1,
         help="Maximum learning rate for the OneCycleLR scheduler."
     )
     anneal_strategy: str = StrArg(
-        "anneal_strategy", choices=['cos', 'linear', 'none'], default='cos',
+        "anneal_strategy", choices=('cos', 'linear', 'none'), default='cos',
         help='Anneal strategy for OneCycleLR scheduler.'
     )
     pct_start: float = FloatArg(
@@ -35,12 +34,8 @@ class OneCycleLRConfig(ArgsGroup):
     )
 
 
-@dataclass
-class SchedulerConfig(ArgsGroup):
-
-    def __post_init__(self):
-        ArgsGroup.__init__(self, "SchedulerConfig", "Scheduler related configs")
-
+@dataclass(slots=True)
+class SchedulerConfig(ArgsGroup, group_name="SchedulerConfig", description="Scheduler related configs"):
     scheduler: str = StrArg(
         "scheduler", choices=AVAIL_SCHEDULERS, default=None, help=f"Default is None.",
         dynamic_defaults_dict=default_data_setting_dict,
@@ -48,7 +43,7 @@ class SchedulerConfig(ArgsGroup):
     )
 
     scheduler_step_every: str = StrArg(
-        "scheduler_step_every", choices=['epoch', 'batch'], default='batch',
+        "scheduler_step_every", choices=('epoch', 'batch'), default='batch',
         help="Specify whether the scheduler step at every batch or every epoch. Typically most schedulers step after"
              " the optimizer steps, which is every _batch_. ",
         dynamic_defaults_dict=default_scheduler_setting_dict
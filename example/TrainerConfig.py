@@ -2,22 +2,24 @@ from dataclasses import dataclass
 from Arg import IntArg, StrArg, BoolArg
 from ArgsGroup import ArgsGroup
 from example.global_vars import default_data_setting_dict
-# configs
-from example.LoggingConfig import LoggingConfig
+
+# children configs
 from example.EpochRunnerConfig import EpochRunnerConfig
+from example.LoggingConfig import LoggingConfig
 from example.CheckpointingConfig import CheckpointingConfig
 from example.OptimizerConfig import OptimizerConfig
 from example.SchedulerConfig import SchedulerConfig
 
 
-AVAIL_CRITERIONS = ['cross_entropy', 'square']
+AVAIL_CRITERIONS = ('cross_entropy', 'square')
 
 
-@dataclass
-class TrainerConfig(ArgsGroup):
+@dataclass(slots=True)
+class TrainerConfig(ArgsGroup, group_name="TrainerConfig", description="Trainer Configs for the project"):
 
     def __post_init__(self):
-        ArgsGroup.__init__(self, "TrainerConfig", "Trainer Configs for the project")
+        ArgsGroup.__post_init__(self)
+        # children configs
         self.epoch_runner_config = EpochRunnerConfig()
         self.logger_config = LoggingConfig()
         self.checkpointing_config = CheckpointingConfig()
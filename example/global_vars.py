@@ -1,5 +1,7 @@
 # set dataset specific settings to overwrite the generic default args.
 
+# Many Args share these dicts (through dynamic_defaults_dict) and read them when they are constructed, so they should
+# not be modified at runtime. Modify the literals below instead.
 default_data_setting_dict = {  # if we would like to set dataset specific params
     'dynamic_default_field': 'dataset',  # this sets the key
     'imagenet': {'n_epochs': 50, 'batch_size': 128, 'log_every': 250,
@@ -1,13 +1,59 @@
 import unittest
-from ArgParser import ArgParser
+from dataclasses import dataclass
+from Arg import IntArg, StrArg
+from ArgParser import ArgParser, split_args_for_options
+from ArgsGroup import ArgsGroup
 from MainConfig import MainConfig
 from example.global_vars import default_data_setting_dict
 
 
+# a small tree where a sibling's dynamic default depends on an Arg of a config spawned by an earlier sibling
+@dataclass(slots=True)
+class SpawnedConfig(ArgsGroup, group_name="SpawnedConfig", field_name="spawned_config"):
+    xx: str = StrArg("xx", default="a")
+
+
+@dataclass(slots=True)
+class SpawningConfig(ArgsGroup, group_name="SpawningConfig"):
+    mode: str = StrArg("mode", default="on", children_args={"on": SpawnedConfig})
+
+
+@dataclass(slots=True)
+class DependentConfig(ArgsGroup, group_name="DependentConfig"):
+    yy: int = IntArg("yy", default=0, dynamic_defaults_dict={"dynamic_default_field": "xx", "a": {"yy": 7}})
+
+
+@dataclass(slots=True)
+class SpawnOrderRootConfig(ArgsGroup, group_name="SpawnOrderRootConfig"):
+    def __post_init__(self):
+        ArgsGroup.__post_init__(self)
+        self.spawning_config = SpawningConfig()
+        self.dependent_config = DependentConfig()
+
+
 class TestMainArgs(unittest.TestCase):
     """
     These tests depend on the project setting. Changing the project configs setting might break these tests.
     """
+    # the parse strings of the tests that only read the parsed configs. Each is parsed once for the class in setUpClass
+    READ_ONLY_PARSE_STRS = (
+        "--wandb --seed 12123 --dataset wikitext",
+        "--wandb --seed 12123 --dataset sst2 --turn_on_torch_amp_autocast",
+        "--wandb --seed 12123 --dataset sst2 --scheduler one_cycle",
+        "--dataset wikitext --n_layer 1234",
+        "--log_every 1 --dataset wikitext",
+        "--dataset wikitext --scheduler reduce_lr_on_plateau",
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        # the parsed configs are shared by the tests of this class so they should not be modified
+        cls.parsed_configs = {}
+        for parse_str in cls.READ_ONLY_PARSE_STRS:
+            args = MainConfig()
+            ArgParser(args).parse_args_recursively(parse_str)
+            cls.parsed_configs[parse_str] = args
+
     def test_arg_parser_workflow(self):
         mainconf = MainConfig()
         # some creation tests
@@ -58,24 +104,18 @@ class TestMainArgs(unittest.TestCase):
         self.assertFalse(mainconf.trainer_config.epoch_runner_config.turn_on_torch_amp_autocast)
 
     def test_dynamic_defaults(self):
-        args = MainConfig()
-        parser = ArgParser(args)
-        parser.parse_args_recursively("--wandb --seed 12123 --dataset wikitext")
+        args = self.parsed_configs["--wandb --seed 12123 --dataset wikitext"]
         # then set defaults according to global_vars default data dicts
         self.assertEqual(args.trainer_config.scheduler_config.scheduler, 'one_cycle')
         self.assertTrue(args.trainer_config.epoch_runner_config.turn_on_torch_amp_autocast)
 
     def test_user_override_dynamic_defaults(self):
-        args = MainConfig()
-        parser = ArgParser(args)
-        parser.parse_args_recursively("--wandb --seed 12123 --dataset sst2 --turn_on_torch_amp_autocast")
+        args = self.parsed_configs["--wandb --seed 12123 --dataset sst2 --turn_on_torch_amp_autocast"]
         # then set defaults according to global_vars default data dicts
         self.assertTrue(args.trainer_config.epoch_runner_config.turn_on_torch_amp_autocast)
 
     def test_spawn_children(self):
-        args = MainConfig()
-        parser = ArgParser(args)
-        parser.parse_args_recursively("--wandb --seed 12123 --dataset sst2 --scheduler one_cycle")
+        args = self.parsed_configs["--wandb --seed 12123 --dataset sst2 --scheduler one_cycle"]
         # then set defaults according to global_vars default data dicts
         from example.SchedulerConfig import OneCycleLRConfig
         self.assertIsInstance(args.trainer_config.scheduler_config.one_cycle, OneCycleLRConfig)
@@ -83,9 +123,7 @@ class TestMainArgs(unittest.TestCase):
 
     def test_spawn_children_with_dynamic_defaults(self):
         # spawn children with defaults
-        args = MainConfig()
-        parser = ArgParser(args)
-        parser.parse_args_recursively("--wandb --seed 12123 --dataset wikitext")
+        args = self.parsed_configs["--wandb --seed 12123 --dataset wikitext"]
         from example.SchedulerConfig import OneCycleLRConfig
         self.assertIsInstance(args.trainer_config.scheduler_config.one_cycle, OneCycleLRConfig)
         self.assertEqual(args.trainer_config.scheduler_config.one_cycle.pct_start, 0.02)
@@ -94,9 +132,7 @@ class TestMainArgs(unittest.TestCase):
         self.assertEqual(args.model_config.gpt_base_configs.n_layer, 12)
 
     def test_spawn_children_with_override_dynamic_defaults(self):
-        args = MainConfig()
-        parser = ArgParser(args)
-        parser.parse_args_recursively("--dataset wikitext --n_layer 1234")
+        args = self.parsed_configs["--dataset wikitext --n_layer 1234"]
         from example.SchedulerConfig import OneCycleLRConfig
         self.assertIsInstance(args.trainer_config.scheduler_config.one_cycle, OneCycleLRConfig)
         self.assertEqual(args.trainer_config.scheduler_config.scheduler_step_every, "batch")
@@ -106,9 +142,7 @@ class TestMainArgs(unittest.TestCase):
         self.assertEqual(args.model_config.gpt_base_configs.n_layer, 1234)
 
     def test_constraints(self):
-        args = MainConfig()
-        parser = ArgParser(args)
-        parser.parse_args_recursively("--log_every 1 --dataset wikitext")
+        args = self.parsed_configs["--log_every 1 --dataset wikitext"]
         self.assertEqual(args.trainer_config.logger_config.log_every, 1)
         args = MainConfig()
         parser = ArgParser(args)
@@ -117,12 +151,28 @@ class TestMainArgs(unittest.TestCase):
             parser.parse_args_recursively("--log_every -1 --dataset wikitext")
 
     def test_dynamic_default_2_levels(self):
-        args = MainConfig()
-        parser = ArgParser(args)
-        parser.parse_args_recursively("--dataset wikitext --scheduler reduce_lr_on_plateau")
+        args = self.parsed_configs["--dataset wikitext --scheduler reduce_lr_on_plateau"]
         self.assertEqual(args.trainer_config.scheduler_config.scheduler, "reduce_lr_on_plateau")
         self.assertEqual(args.trainer_config.scheduler_config.scheduler_step_every, "epoch")
 
+    def test_spawned_children_parsed_before_later_siblings(self):
+        args = SpawnOrderRootConfig()
+        ArgParser(args).parse_args_recursively("")
+        self.assertEqual(args.spawning_config.spawned_config.xx, "a")
+        self.assertEqual(args.dependent_config.yy, 7)
+
+    def test_split_args_known_option_with_space(self):
+        # a sys.argv token such as "--run_name=my run" is an option of the parser that knows --run_name (and of its
+        # abbreviations), not a value of the option before it
+        own_args, other_args = split_args_for_options(
+            ["--n_epochs", "3", "--run_name=my run", "--lr", "0.1", "--run=other run"], ["--run_name", "--n_epochs"])
+        self.assertEqual(own_args, ["--n_epochs", "3", "--run_name=my run", "--run=other run"])
+        self.assertEqual(other_args, ["--lr", "0.1"])
+        # unknown options with a space are still values, as in argparse
+        own_args, other_args = split_args_for_options(["--n_epochs", "-3", "--other=a b"], ["--n_epochs"])
+        self.assertEqual(own_args, ["--n_epochs", "-3", "--other=a b"])
+        self.assertEqual(other_args, [])
+
 
 if __name__ == "__main__":
     unittest.main()
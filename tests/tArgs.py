@@ -26,18 +26,133 @@ class TestMainArgs(unittest.TestCase):
         self.assertEqual(result, expected)
 
     def test_argsgroup_arg_iterate(self):
-        from dataclasses import fields
         mainconf = MainConfig()
         args = mainconf.get_children_args()
-        self.assertEqual(len(args), len(fields(mainconf)))
+        self.assertEqual(len(args), len(mainconf.get_dataclass_fields()))
         children_argsgroup = mainconf.get_all_children_argsgroup()
         for argsgroup in children_argsgroup:
             args = argsgroup.get_children_args()
-            arg_fields = list(filter(lambda x: isinstance(getattr(argsgroup, x.name), Arg), fields(argsgroup)))
+            arg_fields = list(filter(lambda x: isinstance(getattr(argsgroup, x.name), Arg),
+                                    argsgroup.get_dataclass_fields()))
             self.assertEqual(
                 len(args), len(arg_fields),
                 f"Failed for: {str(argsgroup)}. #args={len(args)} vs. #fields={len(arg_fields)}")
 
+    def test_arg_eq_consistent_with_hash(self):
+        int_arg, float_arg = Arg("xx", type=int), Arg("xx", type=float)
+        self.assertNotEqual(int_arg, float_arg)
+        self.assertEqual(int_arg, Arg("xx", type=int))
+        self.assertEqual(hash(int_arg), hash(Arg("xx", type=int)))
+
+    def test_arg_add_dependencies(self):
+        from Arg import IntArg
+        arg = IntArg("n_deps", default=1)
+        dependencies = {"model": "resnet50"}
+        # the dependencies are added in place, as before Args were frozen
+        self.assertIsNone(arg.add_dependencies(dependencies))
+        self.assertEqual(arg.dependencies, {"model": "resnet50"})
+        arg.add_dependencies({"dataset": "mnist"})
+        self.assertEqual(arg.dependencies, {"model": "resnet50", "dataset": "mnist"})
+        self.assertEqual(dependencies, {"model": "resnet50"})
+
+    def test_argsgroup_pickle_and_copy(self):
+        import copy
+        import pickle
+        from ArgParser import ArgParser
+        from example.TrainerConfig import TrainerConfig
+        parsed_main = MainConfig()
+        ArgParser(parsed_main).parse_args_recursively("--dataset wikitext --n_epochs 3")
+        for copy_fn in (copy.deepcopy, lambda config: pickle.loads(pickle.dumps(config))):
+            # unparsed: the copy has the same tree and can still be parsed
+            trainer_conf = copy_fn(TrainerConfig())
+            self.assertEqual([argsgroup.get_name() for argsgroup in trainer_conf.get_all_children_argsgroup()],
+                             [argsgroup.get_name() for argsgroup in TrainerConfig().get_all_children_argsgroup()])
+            self.assertIs(trainer_conf.epoch_runner_config.get_root_argsgroup(), trainer_conf)
+            main_conf = copy_fn(MainConfig())
+            ArgParser(main_conf).parse_args_recursively("--dataset wikitext --n_epochs 3")
+            self.assertEqual(main_conf.get_flattened_all_configs_to_value(),
+                             parsed_main.get_flattened_all_configs_to_value())
+            # parsed
+            trainer_conf = copy_fn(parsed_main.trainer_config)
+            self.assertEqual(trainer_conf.get_flattened_all_configs_to_value(),
+                             parsed_main.trainer_config.get_flattened_all_configs_to_value())
+            self.assertEqual(trainer_conf.n_epochs, 3)
+
+    def test_arg_pickle_and_copy(self):
+        import copy
+        import pickle
+        from Arg import IntArg
+        from ConstraintCheckers import LowerBoundChecker
+        arg = IntArg("n_pickled", default=1, choices=[1, 2, 3], constraint_check_fn=LowerBoundChecker(2))
+        for new_arg in (pickle.loads(pickle.dumps(arg)), copy.deepcopy(arg), copy.copy(arg)):
+            self.assertIsInstance(new_arg, IntArg)
+            self.assertEqual(new_arg, arg)
+            self.assertEqual(hash(new_arg), hash(arg))
+            self.assertEqual(new_arg.cast_value_to_arg_type("3"), 3)
+            self.assertEqual(new_arg.sanitize_value_for_consumption(2), 2)
+            with self.assertRaises(ValueError):
+                new_arg.sanitize_value_for_consumption(1)
+            with self.assertRaises(AssertionError):
+                new_arg.sanitize_value_for_consumption(4)
+
+    def test_dynamic_defaults_keep_default_types(self):
+        from DynamicDefaults import DynamicDefaults
+        bool_default = DynamicDefaults("dataset", None, [(("mnist",), True)])
+        int_default = DynamicDefaults("dataset", None, [(("mnist",), 1)])
+        self.assertIs(type(bool_default.get_dynamic_default("mnist")), bool)
+        self.assertIs(type(int_default.get_dynamic_default("mnist")), int)
+
+    def test_argsgroup_subclass_inherits_class_keywords(self):
+        from dataclasses import dataclass
+        from example.ModelConfig import ModelConfig
+
+        @dataclass
+        class MyModelConfig(ModelConfig):
+            pass
+
+        @dataclass(slots=True)
+        class RenamedModelConfig(ModelConfig, group_name="RenamedModelConfig"):
+            pass
+
+        self.assertEqual(MyModelConfig().get_name(), "ModelConfig")
+        self.assertEqual(MyModelConfig().get_description(), ModelConfig().get_description())
+        self.assertEqual(RenamedModelConfig().get_name(), "RenamedModelConfig")
+        self.assertEqual(RenamedModelConfig().get_description(), ModelConfig().get_description())
+
+    def test_dynamic_defaults_pickle_and_copy(self):
+        import copy
+        import pickle
+        from Arg import IntArg
+        from DynamicDefaults import DYNAMIC_DEFAULT_FLAG
+        arg = IntArg("n_dynamic", default=0,
+                     dynamic_defaults_dict={"dynamic_default_field": "dataset", "mnist": {"n_dynamic": 3}})
+        for new_arg in (pickle.loads(pickle.dumps(arg)), copy.deepcopy(arg)):
+            self.assertIs(new_arg.default, DYNAMIC_DEFAULT_FLAG)
+            self.assertEqual(new_arg.dynamic_default.get_dynamic_default("mnist"), 3)
+            self.assertEqual(new_arg.dynamic_default.get_dynamic_default("cifar10"), 0)
+
+    def test_setting_dicts_pickle(self):
+        import pickle
+        from example.global_vars import default_data_setting_dict, default_scheduler_setting_dict
+        for setting_dict in (default_data_setting_dict, default_scheduler_setting_dict):
+            self.assertEqual(pickle.loads(pickle.dumps(setting_dict)), setting_dict)
+
+    def test_arg_parse_name(self):
+        from Arg import IntArg
+        self.assertEqual(IntArg("lr_steps").get_parse_name(), "--lr_steps")
+        self.assertEqual(IntArg("--lr_steps").get_parse_name(), "--lr_steps")
+        with self.assertRaises(AssertionError):
+            IntArg("-lr_steps")
+
+    def test_args_shared_across_configs(self):
+        # Args are dataclass defaults so every instance of a config holds the same Arg objects
+        first, second = MainConfig(), MainConfig()
+        for arg, other_arg in zip(first.get_children_args(), second.get_children_args()):
+            self.assertIs(arg, other_arg)
+        for argsgroup, other_argsgroup in zip(first.get_all_children_argsgroup(), second.get_all_children_argsgroup()):
+            for arg, other_arg in zip(argsgroup.get_children_args(), other_argsgroup.get_children_args()):
+                self.assertIs(arg, other_arg)
+
 
 if __name__ == "__main__":
     unittest.main()
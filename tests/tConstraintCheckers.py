@@ -1,4 +1,5 @@
 import unittest
+from datetime import date
 from ConstraintCheckers import (
     LowerBoundChecker,
     UpperBoundChecker,
@@ -53,29 +54,37 @@ class TestConstraintCheckers(unittest.TestCase):
         with self.assertRaises(ValueError):
             checker(11)
 
-        # Test incompatible constraints: lower bound > upper bound
-        with self.assertRaises(ValueError):
-            CompositeConstraintChecker([
-                LowerBoundChecker(5, strict=True),
-                UpperBoundChecker(3, strict=False)
-            ])
+    def test_composite_incompatible_constraints(self):
+        scenarios = {
+            "lower bound > upper bound": (LowerBoundChecker(5, strict=True), UpperBoundChecker(3, strict=False)),
+            "lower bound >= upper bound (both strict)": (
+                LowerBoundChecker(5, strict=True), UpperBoundChecker(5, strict=True)),
+            "lower bound >= upper bound (one non-strict)": (
+                LowerBoundChecker(5, strict=False), UpperBoundChecker(5, strict=True)),
+            "lower bound > upper bound (both non-strict)": (
+                LowerBoundChecker(5, strict=False), UpperBoundChecker(3, strict=False)),
+        }
+        # each scenario is reported separately on failure
+        for scenario, checkers in scenarios.items():
+            with self.subTest(scenario):
+                with self.assertRaises(ValueError):
+                    CompositeConstraintChecker(checkers)
 
-        # Test incompatible constraints: lower bound >= upper bound (both strict)
+    def test_composite_equal_bounds(self):
+        # Test equal bounds: the strict one is the tighter
+        checker = CompositeConstraintChecker([
+            LowerBoundChecker(3, strict=False),
+            LowerBoundChecker(3, strict=True),
+            UpperBoundChecker(5, strict=True),
+            UpperBoundChecker(5, strict=False)
+        ])
+        self.assertEqual(checker(4), 4)
         with self.assertRaises(ValueError):
-            CompositeConstraintChecker([
-                LowerBoundChecker(5, strict=True),
-                UpperBoundChecker(5, strict=True)
-            ])
-
-        # Test incompatible constraints: lower bound >= upper bound (one non-strict)
+            checker(3)
         with self.assertRaises(ValueError):
-            CompositeConstraintChecker([
-                LowerBoundChecker(5, strict=False),
-                UpperBoundChecker(5, strict=True)
-            ])
-
-        # Test combined constraints
+            checker(5)
 
+    def test_composite_combined_constraints(self):
         checker = CompositeConstraintChecker([
             LowerBoundChecker(3, strict=False),
             UpperBoundChecker(11, strict=True),
@@ -87,9 +96,48 @@ class TestConstraintCheckers(unittest.TestCase):
         self.assertEqual(checker(7), 7)
         with self.assertRaises(ValueError):
             checker(4)
+        # only the tightest bounds are kept
+        lower, upper = checker.checkers
+        self.assertIsInstance(lower, LowerBoundChecker)
+        self.assertEqual((lower.lower_bound, lower.strict), (5, True))
+        self.assertIsInstance(upper, UpperBoundChecker)
+        self.assertEqual((upper.upper_bound, upper.strict), (7, False))
         with self.assertRaises(ValueError):
             checker(8)
 
+    def test_composite_non_numeric_bounds(self):
+        # the bounds can be any comparable values, also when only one side is bounded
+        checker = CompositeConstraintChecker([LowerBoundChecker(date(2020, 1, 1))])
+        self.assertEqual(checker(date(2021, 1, 1)), date(2021, 1, 1))
+        self.assertEqual(checker.as_function()(date(2021, 1, 1)), date(2021, 1, 1))
+        with self.assertRaises(ValueError):
+            checker(date(2019, 1, 1))
+        checker = CompositeConstraintChecker([UpperBoundChecker("m", strict=True)])
+        self.assertEqual(checker("a"), "a")
+        with self.assertRaises(ValueError):
+            checker("m")
+
+    def test_as_function(self):
+        # the functions returned by as_function accept and reject the same values as the checkers themselves
+        checkers = [
+            LowerBoundChecker(3, strict=True),
+            LowerBoundChecker(3, strict=False),
+            UpperBoundChecker(5, strict=True),
+            UpperBoundChecker(5, strict=False),
+            CompositeConstraintChecker([LowerBoundChecker(3, strict=True), UpperBoundChecker(5, strict=False)]),
+            CompositeConstraintChecker([UpperBoundChecker(5, strict=True)]),
+        ]
+        for checker in checkers:
+            check_fn = checker.as_function()
+            for value in (2, 3, 4, 5, 6):
+                try:
+                    expected = checker(value)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        check_fn(value)
+                else:
+                    self.assertEqual(check_fn(value), expected)
+
 
 if __name__ == '__main__':
     unittest.main()